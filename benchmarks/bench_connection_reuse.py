@@ -0,0 +1,91 @@
+"""
+Per-call latency of SpaceX client requests with and without connection reuse.
+
+Runs a local HTTP/1.1 stand-in for the SpaceX API and simulates repeated syncs
+(launches + rockets + launchpads per sync). Compares the old behaviour, a new
+connection per call (`requests.get`), with the pooled keep-alive session owned
+by `ThirdPartyAPI`, with its rate limiter and response cache out of the way.
+TLS is not used locally, so against the real API the gap is larger because
+every new connection also pays a TLS handshake.
+
+Usage:
+    python benchmarks/bench_connection_reuse.py [--syncs 200]
+"""
+
+import argparse
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from common import report, setup_django, time_calls
+
+setup_django()
+
+import requests  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+from tracker.spacex.client import ThirdPartyAPI  # noqa: E402
+
+PAYLOAD = json.dumps([{"id": str(i), "name": f"item-{i}"} for i in range(50)]).encode()
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(PAYLOAD)))
+        self.end_headers()
+        self.wfile.write(PAYLOAD)
+
+    def log_message(self, *args):
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--syncs", type=int, default=200)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}/"
+    urls = [base_url + resource for resource in ("launches", "rockets", "launchpads")]
+
+    def sync_without_reuse():
+        for url in urls:
+            requests.get(url).json()
+
+    # Measure connection reuse alone: no rate limiting nor response cache
+    settings.SPACEX_RATE_LIMIT = settings.SPACEX_RATE_BURST = 1_000_000
+    ThirdPartyAPI.reset_guards()
+    client = ThirdPartyAPI(use_cache=False)
+
+    def sync_with_reuse():
+        for url in urls:
+            client.get_json_data(url, "get")
+
+    try:
+        # Warm up interpreter caches and the pool before measuring
+        sync_without_reuse()
+        sync_with_reuse()
+
+        per_call = len(urls)
+        fresh = [t / per_call for t in time_calls(sync_without_reuse, args.syncs)]
+        pooled = [t / per_call for t in time_calls(sync_with_reuse, args.syncs)]
+    finally:
+        server.shutdown()
+        ThirdPartyAPI.close_sessions()
+
+    report("new connection per call", fresh)
+    report("pooled keep-alive session", pooled)
+    print(
+        f"per-call latency reduced by "
+        f"{(1 - sum(pooled) / sum(fresh)) * 100:.1f}% over {args.syncs} syncs"
+    )
+
+
+if __name__ == "__main__":
+    main()
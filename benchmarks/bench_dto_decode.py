@@ -0,0 +1,106 @@
+"""
+Memory per object and decode throughput of the slotted, typed DTOs against the
+previous plain dataclasses.
+
+The previous DTOs kept raw strings, so their decode cost is measured together
+with the `datetime.fromisoformat` the ingest loop had to run per launch. Memory
+is measured with tracemalloc over a list of decoded launches; throughput is the
+best of three runs with the garbage collector paused.
+
+Usage:
+    python benchmarks/bench_dto_decode.py [--launches 200000]
+"""
+
+import argparse
+import gc
+import timeit
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from common import setup_django
+
+setup_django()
+
+from tracker.spacex.dataclasses import LaunchDTO  # noqa: E402
+
+
+@dataclass
+class LegacyLaunchDTO:
+    id: str
+    name: str
+    date_utc: str
+    upcoming: bool
+    rocket: str
+    launchpad: str
+    details: Optional[str]
+    success: bool | None = None
+
+
+def legacy_decode(item: dict) -> tuple:
+    launch = LegacyLaunchDTO(
+        id=item.get("id"),
+        name=item.get("name"),
+        date_utc=item.get("date_utc"),
+        upcoming=item.get("upcoming"),
+        success=item.get("success"),
+        rocket=item.get("rocket"),
+        launchpad=item.get("launchpad"),
+        details=item.get("details"),
+    )
+    # Parsing the ingest loop used to do per row
+    launch_datetime = datetime.fromisoformat(launch.date_utc.replace("Z", "+00:00"))
+    return launch, launch_datetime
+
+
+def documents(count: int) -> list[dict]:
+    return [
+        {
+            "id": f"{i:024x}",
+            "name": f"Launch {i}",
+            "date_utc": f"20{i % 20:02d}-0{i % 9 + 1}-1{i % 9}T22:30:00.000Z",
+            "upcoming": False,
+            "success": i % 7 != 0,
+            "rocket": "5e9d0d95eda69973a809d1ec",
+            "launchpad": "5e9e4501f509094ba4566f84",
+            "details": None,
+        }
+        for i in range(count)
+    ]
+
+
+def measure(label: str, decode, docs: list[dict], repeat: int = 3) -> None:
+    gc.disable()
+    try:
+        elapsed = min(
+            timeit.timeit(lambda: [decode(item) for item in docs], number=1)
+            for _ in range(repeat)
+        )
+    finally:
+        gc.enable()
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    kept = [decode(item) for item in docs]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"{label:<22} {len(docs) / elapsed:>12,.0f} objects/s "
+        f"{(after - before) / len(kept):>8.1f} bytes/object"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--launches", type=int, default=200_000)
+    args = parser.parse_args()
+
+    docs = documents(args.launches)
+    measure("legacy dataclass", legacy_decode, docs)
+    measure("slotted typed DTO", LaunchDTO.from_api, docs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Peak memory of `fetch_spacex_data` for growing numbers of launches, which the
+batched ingestion pipeline should keep flat.
+
+Each size runs in a fresh interpreter that replays a synthetic snapshot
+(`--from-snapshot`) into a throwaway on-disk test database, so the numbers
+cover decoding, fingerprinting and writing but no network. Peak RSS is the
+process high-water mark. DEBUG is turned off, as in production, so Django
+doesn't keep a log of every query.
+
+Usage:
+    python benchmarks/bench_ingest_memory.py [--launches 10000 100000 1000000]
+"""
+
+import argparse
+import io
+import logging
+import resource
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+ROCKET = {
+    "id": "5e9d0d95eda69973a809d1ec",
+    "name": "Falcon 9",
+    "mass": {"kg": 549054},
+    "active": True,
+    "stages": 2,
+    "boosters": 0,
+    "success_rate_pct": 98,
+    "cost_per_launch": 50000000,
+    "first_flight": "2010-06-04",
+    "type": "rocket",
+    "description": "Falcon 9 is a two-stage rocket.",
+}
+LAUNCHPAD = {
+    "id": "5e9e4501f509094ba4566f84",
+    "name": "CCSFS SLC 40",
+    "full_name": "Cape Canaveral Space Force Station Space Launch Complex 40",
+    "locality": "Cape Canaveral",
+    "region": "Florida",
+    "launch_attempts": 99,
+    "launch_successes": 97,
+    "status": "active",
+    "latitude": 28.5618571,
+    "longitude": -80.577366,
+    "details": "SpaceX's primary Falcon 9 pad.",
+}
+
+
+def write_snapshot(path: Path, count: int) -> None:
+    from tracker.spacex.snapshot import SnapshotWriter
+
+    writer = SnapshotWriter(path)
+    writer.write("rockets", ROCKET)
+    writer.write("launchpads", LAUNCHPAD)
+    start = datetime(2006, 3, 24, 22, 30, tzinfo=timezone.utc)
+    for i in range(count):
+        date_utc = start + timedelta(minutes=i)
+        writer.write(
+            "launches",
+            {
+                "id": f"{i:024x}",
+                "name": f"Launch {i}",
+                "date_utc": date_utc.isoformat().replace("+00:00", ".000Z"),
+                "upcoming": False,
+                "success": i % 7 != 0,
+                "rocket": ROCKET["id"],
+                "launchpad": LAUNCHPAD["id"],
+                "details": f"Synthetic launch number {i}",
+            },
+        )
+    writer.commit()
+
+
+def run_child(count: int) -> None:
+    from common import setup_django
+
+    setup_django()
+
+    import structlog
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.db import connection
+
+    settings.DEBUG = False
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING)
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot = Path(tmp) / "spacex.ndjson.gz"
+        write_snapshot(snapshot, count)
+
+        # On disk, so stored rows don't count towards the process memory
+        connection.settings_dict["TEST"]["NAME"] = str(Path(tmp) / "db.sqlite3")
+        connection.creation.create_test_db(verbosity=0)
+
+        # The ingest alone, without pre-rendering API responses
+        call_command(
+            "fetch_spacex_data",
+            from_snapshot=str(snapshot),
+            no_warm_up=True,
+            stdout=io.StringIO(),
+        )
+
+    # ru_maxrss is in KiB on Linux
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"launches={count:<10,} peak RSS={peak_rss:8.1f}MiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--launches", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        run_child(args.child)
+        return
+
+    for count in args.launches:
+        subprocess.run(
+            [sys.executable, __file__, "--child", str(count)],
+            check=True,
+            stderr=subprocess.DEVNULL,
+        )
+
+
+if __name__ == "__main__":
+    main()
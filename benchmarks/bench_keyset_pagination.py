@@ -0,0 +1,145 @@
+"""
+Latency of fetching page 1000 of `/api/v1/launches/` from a synthetic table of
+1M launches, with limit/offset pagination (`?pagination=offset`, which also
+counts the rows) against keyset pagination following a cursor.
+
+Requests go through the real viewset, with the response cache disabled, on a
+throwaway on-disk SQLite test database; the pagination queries are also timed
+on their own. Building the table takes a while.
+
+Usage:
+    python benchmarks/bench_keyset_pagination.py [--launches 1000000] [--page 1000]
+"""
+
+import argparse
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from common import report, setup_django, time_calls
+
+setup_django()
+
+from django.conf import settings  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import RequestFactory, override_settings  # noqa: E402
+from django.urls import reverse  # noqa: E402
+from rest_framework.pagination import LimitOffsetPagination  # noqa: E402
+from rest_framework.request import Request  # noqa: E402
+
+from api.pagination import Cursor, LaunchPagination  # noqa: E402
+from api.v1.launch import LaunchViewSet  # noqa: E402
+from tracker.enums import LaunchpadStatus, RocketType  # noqa: E402
+from tracker.models import Launch, Launchpad, Rocket  # noqa: E402
+from tracker.sync import batched  # noqa: E402
+
+PAGE_SIZE = settings.REST_FRAMEWORK["PAGE_SIZE"]
+
+
+def create_launches(count: int) -> None:
+    rocket = Rocket.objects.create(
+        id="5e9d0d95eda69973a809d1ec",
+        name="Falcon 9",
+        mass=549054,
+        type=RocketType.ROCKET,
+        stages=2,
+        cost_per_launch=50000000,
+        first_flight="2010-06-04",
+    )
+    launchpad = Launchpad.objects.create(
+        id="5e9e4501f509094ba4566f84",
+        name="CCSFS SLC 40",
+        full_name="Cape Canaveral Space Force Station Space Launch Complex 40",
+        locality="Cape Canaveral",
+        region="Florida",
+        latitude="28.5618571",
+        longitude="-80.577366",
+        status=LaunchpadStatus.ACTIVE,
+    )
+    start = datetime(2006, 3, 24, 22, 30, tzinfo=timezone.utc)
+    launches = (
+        Launch(
+            id=f"{i:024x}",
+            name=f"Launch {i}",
+            # Every launch time is shared by two launches
+            launch_datetime=start + timedelta(minutes=i // 2),
+            upcoming=False,
+            success=i % 7 != 0,
+            rocket=rocket,
+            launchpad=launchpad,
+        )
+        for i in range(count)
+    )
+    for batch in batched(launches, 10_000):
+        Launch.objects.bulk_create(batch)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--launches", type=int, default=1_000_000)
+    parser.add_argument("--page", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    settings.DEBUG = False
+    settings.ALLOWED_HOSTS = ["localhost"]
+    with tempfile.TemporaryDirectory() as tmp:
+        connection.settings_dict["TEST"]["NAME"] = str(Path(tmp) / "db.sqlite3")
+        connection.creation.create_test_db(verbosity=0)
+        create_launches(args.launches)
+
+        offset = (args.page - 1) * PAGE_SIZE
+        last_of_previous_page = Launch.objects.order_by(
+            *LaunchPagination.ordering
+        ).values_list(*LaunchPagination.ordering)[offset - 1]
+        cursor = LaunchPagination().encode_cursor(
+            Cursor(reverse=False, position=last_of_previous_page)
+        )
+
+        view = LaunchViewSet.as_view({"get": "list"})
+        factory = RequestFactory(HTTP_HOST="localhost")
+        url = reverse("v1:launch-list")
+
+        def fetch(params: dict):
+            response = view(factory.get(url, params))
+            assert response.status_code == 200
+            assert len(response.data["results"]) == PAGE_SIZE
+
+        cache = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+        with override_settings(CACHES=cache):
+            report(
+                f"limit/offset page {args.page}",
+                time_calls(
+                    lambda: fetch({"pagination": "offset", "offset": offset}),
+                    args.repeat,
+                ),
+            )
+            report(
+                f"keyset page {args.page}",
+                time_calls(lambda: fetch({"cursor": cursor}), args.repeat),
+            )
+
+        # The pagination queries alone, without serializing the page
+        queryset = LaunchViewSet.queryset
+
+        def paginate(paginator, params: dict):
+            request = Request(factory.get(url, params))
+            assert len(paginator.paginate_queryset(queryset, request)) == PAGE_SIZE
+
+        report(
+            "  queries only, limit/offset",
+            time_calls(
+                lambda: paginate(LimitOffsetPagination(), {"offset": offset}),
+                args.repeat,
+            ),
+        )
+        report(
+            "  queries only, keyset",
+            time_calls(
+                lambda: paginate(LaunchPagination(), {"cursor": cursor}), args.repeat
+            ),
+        )
+
+
+if __name__ == "__main__":
+    main()
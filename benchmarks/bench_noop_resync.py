@@ -0,0 +1,118 @@
+"""
+Rows written and time taken by a no-op resync of synthetic launches, with the
+fingerprint check of `tracker.sync.upsert` against rewriting every row with
+one INSERT .. ON CONFLICT DO UPDATE per batch, as the sync did before.
+
+Runs against a throwaway test database, the project database is not touched.
+
+Usage:
+    python benchmarks/bench_noop_resync.py [--launches 20000]
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+
+from common import setup_django
+
+setup_django()
+
+from django.db import connection  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+
+from tracker.enums import LaunchpadStatus, RocketType  # noqa: E402
+from tracker.models import Launch, Launchpad, Rocket  # noqa: E402
+from tracker.spacex.dataclasses import LaunchDTO  # noqa: E402
+from tracker.sync import (  # noqa: E402
+    LAUNCH_FIELDS,
+    SYNC_BATCH_SIZE,
+    batched,
+    launch_from_dto,
+    upsert,
+)
+
+ROCKET_ID = "5e9d0d95eda69973a809d1ec"
+LAUNCHPAD_ID = "5e9e4501f509094ba4566f84"
+
+
+def launches(count: int) -> list[LaunchDTO]:
+    start = datetime(2006, 3, 24, 22, 30, tzinfo=timezone.utc)
+    return [
+        LaunchDTO(
+            id=f"{i:024x}",
+            name=f"Launch {i}",
+            date_utc=start + timedelta(days=i),
+            upcoming=False,
+            rocket=ROCKET_ID,
+            launchpad=LAUNCHPAD_ID,
+            details=f"Synthetic launch number {i}",
+            success=i % 7 != 0,
+        )
+        for i in range(count)
+    ]
+
+
+def rewrite_all(dtos: list[LaunchDTO]) -> int:
+    written = 0
+    for batch in batched(map(launch_from_dto, dtos), SYNC_BATCH_SIZE):
+        Launch.objects.bulk_create(
+            batch,
+            update_conflicts=True,
+            update_fields=list(LAUNCH_FIELDS),
+            unique_fields=["id"],
+        )
+        written += len(batch)
+    return written
+
+
+def fingerprinted(dtos: list[LaunchDTO]) -> int:
+    return upsert(Launch, map(launch_from_dto, dtos), LAUNCH_FIELDS).changed
+
+
+def measure(label: str, sync, dtos: list[LaunchDTO]) -> None:
+    with CaptureQueriesContext(connection) as queries:
+        start = time.perf_counter()
+        written = sync(dtos)
+        elapsed = (time.perf_counter() - start) * 1000
+    writes = sum(1 for q in queries if q["sql"].startswith("INSERT"))
+    print(
+        f"{label:<22} rows written={written:<8} write queries={writes:<5} "
+        f"time={elapsed:9.1f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--launches", type=int, default=20_000)
+    args = parser.parse_args()
+
+    connection.creation.create_test_db(verbosity=0)
+    Rocket.objects.create(
+        id=ROCKET_ID,
+        name="Falcon 1",
+        mass=30146,
+        type=RocketType.MERLIN,
+        stages=2,
+        cost_per_launch=6700000,
+        first_flight="2006-03-24",
+    )
+    Launchpad.objects.create(
+        id=LAUNCHPAD_ID,
+        name="Kwajalein Atoll",
+        full_name="Kwajalein Atoll Omelek Island",
+        locality="Omelek Island",
+        region="Marshall Islands",
+        latitude="9.0477206",
+        longitude="167.7431292",
+        status=LaunchpadStatus.RETIRED,
+    )
+
+    dtos = launches(args.launches)
+    # Initial sync, then a resync of the very same documents
+    fingerprinted(dtos)
+    measure("rewrite every row", rewrite_all, dtos)
+    measure("fingerprint check", fingerprinted, dtos)
+
+
+if __name__ == "__main__":
+    main()
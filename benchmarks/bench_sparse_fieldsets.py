@@ -0,0 +1,70 @@
+"""
+Response size and latency of a page of `/api/v1/launches/` with the rocket and
+launchpad nested (`?expand=rocket,launchpad`, the shape every response had
+before sparse fieldsets), with their ids (the default), and with a handful of
+fields (`?fields=id,name,launch_datetime`).
+
+Requests go through the real viewset and JSON renderer, with the response
+cache disabled, on a throwaway on-disk SQLite test database.
+
+Usage:
+    python benchmarks/bench_sparse_fieldsets.py [--launches 10000] [--limit 1000]
+"""
+
+import argparse
+import tempfile
+from pathlib import Path
+
+from bench_keyset_pagination import create_launches
+from common import report, setup_django, time_calls
+
+setup_django()
+
+from django.conf import settings  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import RequestFactory, override_settings  # noqa: E402
+from django.urls import reverse  # noqa: E402
+
+from api.v1.launch import LaunchViewSet  # noqa: E402
+
+SHAPES = {
+    "expanded": {"expand": "rocket,launchpad"},
+    "ids": {},
+    "sparse": {"fields": "id,name,launch_datetime"},
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--launches", type=int, default=10_000)
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    settings.DEBUG = False
+    settings.ALLOWED_HOSTS = ["localhost"]
+    with tempfile.TemporaryDirectory() as tmp:
+        connection.settings_dict["TEST"]["NAME"] = str(Path(tmp) / "db.sqlite3")
+        connection.creation.create_test_db(verbosity=0)
+        create_launches(args.launches)
+
+        view = LaunchViewSet.as_view({"get": "list"})
+        factory = RequestFactory(HTTP_HOST="localhost")
+        url = reverse("v1:launch-list")
+
+        def fetch(params: dict) -> bytes:
+            response = view(factory.get(url, {**params, "limit": args.limit}))
+            assert response.status_code == 200
+            return response.render().content
+
+        cache = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+        with override_settings(CACHES=cache):
+            for shape, params in SHAPES.items():
+                size = len(fetch(params))
+                print(f"{shape:<10} {size / 1024:10.1f} KiB per {args.limit} launches")
+            for shape, params in SHAPES.items():
+                report(shape, time_calls(lambda: fetch(params), args.repeat))
+
+
+if __name__ == "__main__":
+    main()
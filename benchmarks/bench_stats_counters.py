@@ -0,0 +1,82 @@
+"""
+Time of refreshing the launch statistics after a sync which changed a single
+launch, over synthetic tables of 100k and 1M launches: recounting every launch
+into the counters (`tracker.stats.rebuild_launch_stats`, as each sync did
+before) against applying the counter deltas of the changed launch
+(`tracker.stats.update_launch_stats`). The counters must match a full recount
+afterwards.
+
+Runs on a throwaway on-disk SQLite test database. Building the 1M launch table
+takes a while.
+
+Usage:
+    python benchmarks/bench_stats_counters.py [--launches 100000 1000000]
+"""
+
+import argparse
+import tempfile
+from pathlib import Path
+
+from bench_stats_engine import create_launches
+from common import report, setup_django, time_calls
+
+setup_django()
+
+from django.conf import settings  # noqa: E402
+from django.db import connection  # noqa: E402
+
+from tracker.aggregates import (  # noqa: E402
+    COUNTED_FIELDS,
+    LaunchCountDeltas,
+    stored_launch_counts,
+)
+from tracker.models import Launch  # noqa: E402
+from tracker.stats import (  # noqa: E402
+    count_launches,
+    rebuild_launch_stats,
+    update_launch_stats,
+)
+
+
+def flip_outcome(launch: Launch) -> dict:
+    """Flip the outcome of `launch` in the DB, returning its previous fields."""
+    previous = {name: getattr(launch, name) for name in COUNTED_FIELDS}
+    launch.success = not launch.success
+    launch.save(update_fields=["success"])
+    return previous
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--launches", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    settings.DEBUG = False
+    for count in args.launches:
+        with tempfile.TemporaryDirectory() as tmp:
+            connection.settings_dict["TEST"]["NAME"] = str(Path(tmp) / "db.sqlite3")
+            connection.creation.create_test_db(verbosity=0)
+            create_launches(count)
+            rebuild_launch_stats()
+            launch = Launch.objects.filter(success__isnull=False).first()
+
+            def recount():
+                flip_outcome(launch)
+                rebuild_launch_stats()
+
+            def apply_deltas():
+                deltas = LaunchCountDeltas()
+                deltas.written(flip_outcome(launch), launch)
+                update_launch_stats(deltas)
+
+            report(f"recount, {count} launches", time_calls(recount, args.repeat))
+            report(f"deltas, {count} launches", time_calls(apply_deltas, args.repeat))
+            assert stored_launch_counts() == count_launches(Launch.objects.all())
+            connection.creation.destroy_test_db(
+                connection.settings_dict["NAME"], verbosity=0
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Time of computing the launch statistics over synthetic tables of 100k and 1M
+launches, with the previous four GROUP BY queries (each scanning the launches
+on its own) against `tracker.stats.compute_launch_stats`, which counts them in
+one streamed pass and folds the counts in Python. Both must give the same
+result.
+
+Runs on a throwaway on-disk SQLite test database. Building the 1M launch table
+takes a while.
+
+Usage:
+    python benchmarks/bench_stats_engine.py [--launches 100000 1000000]
+"""
+
+import argparse
+import tempfile
+from bisect import bisect_right
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from common import report, setup_django, time_calls
+
+setup_django()
+
+from django.conf import settings  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.db.models import (  # noqa: E402
+    Case,
+    Count,
+    F,
+    FloatField,
+    Q,
+    Value,
+    When,
+)
+from django.db.models.functions import TruncMonth, TruncYear  # noqa: E402
+
+from tracker.enums import LaunchpadStatus, RocketType  # noqa: E402
+from tracker.models import Launch, Launchpad, Rocket  # noqa: E402
+from tracker.stats import compute_launch_stats  # noqa: E402
+from tracker.sync import batched  # noqa: E402
+
+ROCKETS = 4
+LAUNCHPADS = 6
+
+
+def four_queries_launch_stats() -> dict:
+    """The launch statistics as the stats view computed them before."""
+    qs = Launch.objects.all()
+    rocket_stats = (
+        qs.values("rocket__name")
+        .annotate(
+            total=Count("id"),
+            success_count=Count("id", filter=Q(success=True)),
+        )
+        .annotate(
+            success_rate=Case(
+                When(total=0, then=Value(0.0)),
+                default=(F("success_count") * 100.0 / F("total")),
+                output_field=FloatField(),
+            )
+        )
+        .order_by("-total")
+    )
+    site_stats = (
+        qs.values("launchpad__name").annotate(total=Count("id")).order_by("-total")
+    )
+    yearly_stats = (
+        qs.annotate(year=TruncYear("launch_datetime"))
+        .values("year")
+        .annotate(count=Count("id"))
+        .order_by("year")
+    )
+    monthly_stats = (
+        qs.annotate(month=TruncMonth("launch_datetime"))
+        .values("month")
+        .annotate(count=Count("id"))
+        .order_by("month")
+    )
+    return {
+        "rocket_success_rates": list(rocket_stats),
+        "launches_per_site": list(site_stats),
+        "yearly_frequency": list(yearly_stats),
+        "monthly_frequency": list(monthly_stats),
+    }
+
+
+def create_launches(count: int) -> None:
+    rockets = Rocket.objects.bulk_create(
+        Rocket(
+            id=f"r{i}",
+            name=f"Rocket {i}",
+            mass=549054,
+            type=RocketType.ROCKET,
+            stages=2,
+            cost_per_launch=50000000,
+            first_flight="2010-06-04",
+        )
+        for i in range(ROCKETS)
+    )
+    launchpads = Launchpad.objects.bulk_create(
+        Launchpad(
+            id=f"lp{i}",
+            name=f"Launchpad {i}",
+            full_name=f"Launchpad {i}",
+            locality="Cape Canaveral",
+            region="Florida",
+            latitude="28.5618571",
+            longitude="-80.577366",
+            status=LaunchpadStatus.ACTIVE,
+        )
+        for i in range(LAUNCHPADS)
+    )
+    start = datetime(2006, 3, 24, 22, 30, tzinfo=timezone.utc)
+    # Spread over 20 years
+    step = timedelta(days=20 * 365) / count
+    launches = (
+        Launch(
+            id=f"{i:024x}",
+            name=f"Launch {i}",
+            launch_datetime=start + i * step,
+            upcoming=False,
+            success=None if i % 11 == 0 else i % 7 != 0,
+            # 1, 2, 3... parts of the launches each, as the order of rockets or
+            # launchpads tied on launches isn't defined by the previous queries
+            rocket=rockets[bisect_right((1, 3, 6), i % 10)],
+            launchpad=launchpads[bisect_right((1, 3, 6, 10, 15), i % 21)],
+        )
+        for i in range(count)
+    )
+    for batch in batched(launches, 10_000):
+        Launch.objects.bulk_create(batch)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--launches", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    settings.DEBUG = False
+    for count in args.launches:
+        with tempfile.TemporaryDirectory() as tmp:
+            connection.settings_dict["TEST"]["NAME"] = str(Path(tmp) / "db.sqlite3")
+            connection.creation.create_test_db(verbosity=0)
+            create_launches(count)
+
+            assert compute_launch_stats() == four_queries_launch_stats()
+            report(
+                f"four queries, {count} launches",
+                time_calls(four_queries_launch_stats, args.repeat),
+            )
+            report(
+                f"single pass, {count} launches",
+                time_calls(compute_launch_stats, args.repeat),
+            )
+            connection.creation.destroy_test_db(
+                connection.settings_dict["NAME"], verbosity=0
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Peak memory and time of decoding a synthetic SpaceX launches query response.
+
+Compares the buffered path (read the whole body, `json.loads` it, then build a
+list of DTOs) with the streaming path (`iter_json_array` decoding documents as
+chunks arrive, with `LaunchDTO.from_api` applied by a generator). Every mode
+runs in a fresh interpreter so peak RSS is not shared between them.
+
+Usage:
+    python benchmarks/bench_streaming_decode.py [--launches 500000]
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+
+from common import setup_django
+
+CHUNK_SIZE = 64 * 1024
+MODES = ("buffered", "streamed-list", "streamed")
+
+
+def synthetic_chunks(count: int):
+    """Yield a `{"docs": [...]}` response body of `count` launches in chunks."""
+    buffer = [b'{"docs": [']
+    size = 0
+    for i in range(count):
+        doc = json.dumps(
+            {
+                "id": f"{i:024x}",
+                "name": f"Launch {i}",
+                "date_utc": "2020-01-01T00:00:00.000Z",
+                "upcoming": False,
+                "success": i % 7 != 0,
+                "rocket": "5e9d0d95eda69973a809d1ec",
+                "launchpad": "5e9e4501f509094ba4566f84",
+                "details": "Synthetic launch used for benchmarking " * 2,
+            }
+        ).encode()
+        buffer.append(doc if i == 0 else b"," + doc)
+        size += len(doc) + 1
+        if size >= CHUNK_SIZE:
+            yield b"".join(buffer)
+            buffer, size = [], 0
+    buffer.append(b'], "totalDocs": %d, "hasNextPage": false}' % count)
+    yield b"".join(buffer)
+
+
+def run(mode: str, count: int) -> None:
+    setup_django()
+
+    from tracker.spacex.dataclasses import LaunchDTO
+    from tracker.spacex.streaming import iter_json_array
+
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+
+    if mode == "buffered":
+        body = b"".join(synthetic_chunks(count))
+        docs = json.loads(body)["docs"]
+        launches = [LaunchDTO.from_api(item) for item in docs]
+        decoded = len(launches)
+    else:
+        launches = (
+            LaunchDTO.from_api(item)
+            for item in iter_json_array(synthetic_chunks(count), key="docs")
+        )
+        if mode == "streamed-list":
+            launches = list(launches)
+            decoded = len(launches)
+        else:
+            decoded = sum(1 for _ in launches)
+
+    elapsed = time.perf_counter() - start
+    peak_mb = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline_kb) / 1024
+    print(
+        f"{mode:<14} launches={decoded:<8} time={elapsed:7.2f}s "
+        f"peak RSS growth={peak_mb:8.1f}MB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--launches", type=int, default=500_000)
+    parser.add_argument("--mode", choices=MODES)
+    args = parser.parse_args()
+
+    if args.mode:
+        run(args.mode, args.launches)
+        return
+
+    for mode in MODES:
+        subprocess.run(
+            [
+                sys.executable,
+                __file__,
+                "--mode",
+                mode,
+                "--launches",
+                str(args.launches),
+            ],
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
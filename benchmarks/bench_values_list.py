@@ -0,0 +1,82 @@
+"""
+Throughput of `/api/v1/launches/` pages of 100 and 1000 launches built from
+`values()` rows (the list action of `LaunchViewSet`) against the same pages
+built with `LaunchSerializer` from model instances, with launch relations as
+ids and expanded.
+
+Requests go through the real viewset and JSON renderer, with the response
+cache disabled, on a throwaway on-disk SQLite test database. Both paths are
+checked to render the same bytes first.
+
+Usage:
+    python benchmarks/bench_values_list.py [--launches 10000]
+"""
+
+import argparse
+import statistics
+import tempfile
+from pathlib import Path
+
+from bench_keyset_pagination import create_launches
+from common import report, setup_django, time_calls
+
+setup_django()
+
+from django.conf import settings  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import RequestFactory, override_settings  # noqa: E402
+from django.urls import reverse  # noqa: E402
+from rest_framework.mixins import ListModelMixin  # noqa: E402
+
+from api.v1.launch import LaunchViewSet  # noqa: E402
+
+
+class SerializerLaunchViewSet(LaunchViewSet):
+    """LaunchViewSet listing through LaunchSerializer, as it did before."""
+
+    list = ListModelMixin.list
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--launches", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    settings.DEBUG = False
+    settings.ALLOWED_HOSTS = ["localhost"]
+    with tempfile.TemporaryDirectory() as tmp:
+        connection.settings_dict["TEST"]["NAME"] = str(Path(tmp) / "db.sqlite3")
+        connection.creation.create_test_db(verbosity=0)
+        create_launches(args.launches)
+
+        factory = RequestFactory(HTTP_HOST="localhost")
+        url = reverse("v1:launch-list")
+        views = {
+            "serializer": SerializerLaunchViewSet.as_view({"get": "list"}),
+            "values": LaunchViewSet.as_view({"get": "list"}),
+        }
+
+        def fetch(path: str, params: dict) -> bytes:
+            response = views[path](factory.get(url, params))
+            assert response.status_code == 200
+            return response.render().content
+
+        cache = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+        with override_settings(CACHES=cache):
+            for limit in (100, 1000):
+                for shape, params in (
+                    ("ids", {}),
+                    ("expanded", {"expand": "rocket,launchpad"}),
+                ):
+                    params = {**params, "limit": limit}
+                    assert fetch("serializer", params) == fetch("values", params)
+                    for path in views:
+                        timings = time_calls(lambda: fetch(path, params), args.repeat)
+                        report(f"{path} {shape} {limit} rows", timings)
+                        rows_per_s = limit / statistics.median(timings) * 1000
+                        print(f"{'':<32} {rows_per_s:,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+
+def setup_django() -> None:
+    """Make the Django project importable and configured for standalone scripts."""
+    if str(SRC_DIR) not in sys.path:
+        sys.path.insert(0, str(SRC_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
+
+    import django
+
+    django.setup()
+
+
+def time_calls(func, repeat: int) -> list[float]:
+    """Call `func` `repeat` times and return each call's duration in ms."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(label: str, timings: list[float]) -> None:
+    print(
+        f"{label:<32} n={len(timings):<6} "
+        f"mean={statistics.mean(timings):8.3f}ms "
+        f"p50={statistics.median(timings):8.3f}ms "
+        f"max={max(timings):8.3f}ms"
+    )
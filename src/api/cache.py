@@ -0,0 +1,285 @@
+from datetime import date, datetime, timezone
+from functools import wraps
+from hashlib import md5
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import structlog
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import DisallowedHost
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.response import Response
+
+from tracker.data_version import SCOPES, get_data_states
+from tracker.models import DataVersion, Rocket
+
+from .pagination import PAGINATION_QUERY_PARAM, KeysetPagination
+
+logger = structlog.get_logger(__name__)
+
+
+RESPONSE_KEY = "api:response:{view}:{action}:{versions}:{url}"
+COUNTER_KEY = "api:response-cache:{view}:{event}"
+EVENTS = ("hits", "misses")
+
+
+def count(view: str, event: str) -> None:
+    key = COUNTER_KEY.format(view=view, event=event)
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Evicted since add()
+            cache.set(key, 1, timeout=None)
+
+
+def cache_response(action):
+    """
+    Cache the data of successful responses of a viewset action until the data
+    it is built from changes. Keys include the view's canonical URL (see
+    `CachedResponseMixin.cache_key_url`) and the versions of its `cache_scopes`,
+    so entries have no TTL: a sync bumping one of these versions makes the view
+    miss, while views depending on other scopes keep their entries.
+
+    The key also makes a strong ETag, and the last bump of these versions the
+    Last-Modified date, so conditional requests which are still fresh get a
+    304 before the action runs, i.e. before any query or serialization.
+    """
+
+    @wraps(action)
+    def wrapper(self, request, *args, **kwargs):
+        view = type(self).__name__
+        states = get_data_states(self.cache_scopes).values()
+        key = RESPONSE_KEY.format(
+            view=view,
+            action=self.action,
+            versions=".".join(str(state.version) for state in states),
+            url=md5(self.cache_key_url(request).encode()).hexdigest(),
+        )
+        etag = quote_etag(md5(key.encode()).hexdigest())
+        updated_at = [state.updated_at for state in states if state.updated_at]
+        last_modified = int(max(updated_at).timestamp()) if updated_at else None
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is not None:
+            # Not modified: the client's copy is as good as a cached one
+            count(view, "hits")
+        elif (data := cache.get(key)) is not None:
+            count(view, "hits")
+            response = Response(data)
+            response["X-Cache"] = "HIT"
+        else:
+            count(view, "misses")
+            response = action(self, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                cache.set(key, response.data, timeout=None)
+            response["X-Cache"] = "MISS"
+
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response["ETag"] = etag
+            if last_modified is not None:
+                response["Last-Modified"] = http_date(last_modified)
+        patch_cache_control(response, max_age=settings.API_CACHE_CONTROL_MAX_AGE)
+        return response
+
+    wrapper.cached_response = True
+    return wrapper
+
+
+def canonical_values(value) -> list[str]:
+    """Query param values of a validated filter value."""
+    if isinstance(value, (list, tuple)):
+        return [v for item in value for v in canonical_values(item)]
+    if isinstance(value, bool):
+        return ["true" if value else "false"]
+    if isinstance(value, datetime):
+        return [value.astimezone(timezone.utc).isoformat()]
+    if isinstance(value, date):
+        return [value.isoformat()]
+    return [str(value)]
+
+
+class CachedResponseMixin:
+    """
+    Cache the `list` and `retrieve` actions of a viewset with `cache_response`.
+    `cache_scopes` names the tracker.data_version scopes their data comes from.
+    """
+
+    cache_scopes: tuple[str, ...] = SCOPES
+    cached_views: dict[str, type] = {}
+    cached_actions = ("list", "retrieve")
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        CachedResponseMixin.cached_views[cls.__name__] = cls
+        for name in cls.cached_actions:
+            action = getattr(cls, name, None)
+            if action is not None and not getattr(action, "cached_response", False):
+                setattr(cls, name, cache_response(action))
+
+    def cache_key_url(self, request) -> str:
+        """
+        The request's URL with its query replaced by `cache_key_params`, sorted.
+        Scheme and host are kept as cached data holds absolute pagination links.
+        """
+        query = urlencode(sorted(self.cache_key_params(request).items()), doseq=True)
+        return f"{request.build_absolute_uri(request.path)}?{query}"
+
+    def cache_key_params(self, request) -> dict[str, list[str]]:
+        """
+        Query params in a canonical form, so that equivalent queries share a
+        cache entry: filters are replaced by their validated values, dropping
+        empty ones, and pagination params by the limit and offset in effect,
+        dropping the default limit. Other params, such as keyset cursors, are
+        kept as they are.
+        """
+        params = {name: sorted(values) for name, values in request.query_params.lists()}
+
+        filterset_class = getattr(self, "filterset_class", None)
+        if filterset_class is not None:
+            filterset = filterset_class(
+                request.query_params, queryset=self.get_queryset(), request=request
+            )
+            # Invalid filters get a 400 response, which is not cached
+            if filterset.is_valid():
+                for name, value in filterset.form.cleaned_data.items():
+                    params.pop(name, None)
+                    if value not in (None, "", []):
+                        params[name] = canonical_values(value)
+
+        paginator = self.paginator
+        if isinstance(paginator, (LimitOffsetPagination, KeysetPagination)):
+            limit = paginator.get_limit(request)
+            params.pop(paginator.limit_query_param, None)
+            if limit != paginator.default_limit:
+                params[paginator.limit_query_param] = [str(limit)]
+        if isinstance(paginator, LimitOffsetPagination):
+            offset = paginator.get_offset(request)
+            # Limit/offset pages are shaped differently from keyset ones
+            params.pop(PAGINATION_QUERY_PARAM, None)
+            params[paginator.offset_query_param] = [str(offset)]
+
+        return params
+
+
+def response_cache_stats() -> dict:
+    """
+    Hits and misses of each cached view since the cache was last cleared, and
+    invalidations of each data scope, i.e. how many times a sync changed it.
+    """
+    counters = cache.get_many(
+        COUNTER_KEY.format(view=view, event=event)
+        for view in CachedResponseMixin.cached_views
+        for event in EVENTS
+    )
+    views = {}
+    for view in CachedResponseMixin.cached_views:
+        hits, misses = (
+            counters.get(COUNTER_KEY.format(view=view, event=event), 0)
+            for event in EVENTS
+        )
+        views[view] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else None,
+        }
+
+    return {
+        "views": views,
+        "invalidations": dict(
+            DataVersion.objects.values_list("scope", "version").order_by("scope")
+        ),
+    }
+
+
+def warm_up_requests() -> list[tuple[str, dict, int]]:
+    """
+    Paths, query params and number of pages pre-rendered after a sync: the
+    stats, the first `API_CACHE_WARMUP_PAGES` pages of launches,
+    `API_CACHE_WARMUP_FILTERS` and launches of each rocket.
+    """
+    launches = reverse("v1:launch-list")
+    return [
+        (reverse("v1:launch-stats-list"), {}, 1),
+        (launches, {}, settings.API_CACHE_WARMUP_PAGES),
+        *((launches, params, 1) for params in settings.API_CACHE_WARMUP_FILTERS),
+        *(
+            (launches, {"rocket__name": name}, 1)
+            for name in Rocket.objects.values_list("name", flat=True).distinct()
+        ),
+    ]
+
+
+def warm_up_host() -> str | None:
+    """
+    `API_CACHE_WARMUP_HOST` if it's a host ALLOWED_HOSTS allows, else None,
+    logging why there's no warm-up. Patterns of ALLOWED_HOSTS such as "*" or
+    ".example.com" won't do: keys include the host requests are made on.
+    """
+    host = settings.API_CACHE_WARMUP_HOST
+    if not host:
+        reason = "API_CACHE_WARMUP_HOST isn't set"
+    elif "*" in host or host.startswith("."):
+        reason = f"API_CACHE_WARMUP_HOST {host!r} is a pattern, not a host"
+    else:
+        try:
+            RequestFactory(HTTP_HOST=host).get("/").get_host()
+            return host
+        except DisallowedHost:
+            reason = f"API_CACHE_WARMUP_HOST {host!r} isn't in ALLOWED_HOSTS"
+    logger.info("API cache warm-up skipped", reason=reason)
+    return None
+
+
+def warm_up_api_cache() -> int:
+    """
+    Cache the responses of `warm_up_requests` as requested on
+    `API_CACHE_WARMUP_HOST`, see `warm_up_host`: cached data holds absolute
+    pagination links, hence keys include the host. Following pages are
+    requested through the `next` link of the previous one, as clients do.
+    Returns how many responses were cached.
+
+    Only useful with a cache shared between processes, e.g. Redis or
+    Memcached: a local-memory cache is only warmed up for this process.
+    """
+    host = warm_up_host()
+    if host is None:
+        return 0
+    factory = RequestFactory(HTTP_HOST=host)
+    cached = 0
+    for path, params, pages in warm_up_requests():
+        for _ in range(pages):
+            # The sync is committed by now, a failed warm-up only costs a miss
+            try:
+                match = resolve(path)
+                response = match.func(
+                    factory.get(path, params), *match.args, **match.kwargs
+                )
+                error = None if response.status_code == 200 else response.status_code
+            except Exception as exc:
+                error = repr(exc)
+            if error is not None:
+                logger.warning(
+                    "API cache warm-up request failed",
+                    path=path,
+                    params=params,
+                    error=error,
+                )
+                break
+
+            cached += 1
+            next_link = response.data.get("next")
+            if not next_link:
+                break
+            url = urlsplit(next_link)
+            path, params = url.path, dict(parse_qsl(url.query))
+
+    logger.info("API cache warmed up", responses=cached)
+    return cached
@@ -0,0 +1,107 @@
+from django.db.models import QuerySet
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+FIELDS_QUERY_PARAM = "fields"
+EXPAND_QUERY_PARAM = "expand"
+
+
+def list_param(request, name: str) -> list[str] | None:
+    """Comma separated values of a query param, None if it isn't given."""
+    if name not in request.query_params:
+        return None
+    return [
+        value.strip()
+        for param in request.query_params.getlist(name)
+        for value in param.split(",")
+        if value.strip()
+    ]
+
+
+class SparseFieldsetSerializerMixin:
+    """
+    Serializer taking the subset of its fields to render as `fields` and the
+    names of `expandable_fields` to render as nested objects, instead of the
+    ids of their related objects, as `expand`.
+    """
+
+    expandable_fields: dict[str, type[serializers.Serializer]] = {}
+
+    def __init__(self, *args, fields=None, expand=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        for name in expand:
+            self.fields[name] = self.expandable_fields[name](read_only=True)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class SparseFieldsetViewMixin:
+    """
+    Read `?fields=` and `?expand=` for a serializer using
+    `SparseFieldsetSerializerMixin`. The queryset follows along: only expanded
+    relations are joined and only the columns rendered, plus the ones in
+    `required_fields`, e.g. needed for pagination, are loaded.
+
+    Goes before `CachedResponseMixin` in the bases of a cached view, to have
+    equivalent `fields` and `expand` params share a cache entry.
+    """
+
+    required_fields: tuple[str, ...] = ()
+
+    def get_fields_param(self) -> list[str] | None:
+        # An empty `?fields=` renders every field, like no param at all
+        fields = list_param(self.request, FIELDS_QUERY_PARAM) or None
+        if fields is not None:
+            unknown = set(fields) - set(self.get_serializer_class().Meta.fields)
+            if unknown:
+                message = f"Unknown fields: {', '.join(sorted(unknown))}"
+                raise ValidationError({FIELDS_QUERY_PARAM: message})
+        return fields
+
+    def get_expand_param(self) -> list[str]:
+        expand = list_param(self.request, EXPAND_QUERY_PARAM) or []
+        expandable = self.get_serializer_class().expandable_fields
+        unknown = set(expand) - set(expandable)
+        if unknown:
+            message = (
+                f"Can't expand: {', '.join(sorted(unknown))}. "
+                f"Expandable: {', '.join(expandable)}"
+            )
+            raise ValidationError({EXPAND_QUERY_PARAM: message})
+        fields = self.get_fields_param()
+        # Expanding a field which isn't rendered is pointless
+        return [name for name in expand if fields is None or name in fields]
+
+    def cache_key_params(self, request) -> dict[str, list[str]]:
+        # Field order doesn't change a response, nor do empty fields or
+        # expanding nothing
+        params = super().cache_key_params(request)
+        params.pop(FIELDS_QUERY_PARAM, None)
+        if fields := self.get_fields_param():
+            params[FIELDS_QUERY_PARAM] = [",".join(sorted(set(fields)))]
+        params.pop(EXPAND_QUERY_PARAM, None)
+        if expand := self.get_expand_param():
+            params[EXPAND_QUERY_PARAM] = [",".join(sorted(set(expand)))]
+        return params
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault("fields", self.get_fields_param())
+        kwargs.setdefault("expand", self.get_expand_param())
+        return super().get_serializer(*args, **kwargs)
+
+    def get_queryset(self) -> QuerySet:
+        queryset = super().get_queryset()
+        serializer_class = self.get_serializer_class()
+        fields = self.get_fields_param() or serializer_class.Meta.fields
+        expand = self.get_expand_param()
+
+        columns = {*fields, *self.required_fields}
+        for name in expand:
+            nested = serializer_class.expandable_fields[name].Meta.fields
+            columns.update(f"{name}__{field}" for field in nested)
+        queryset = queryset.select_related(None)
+        # Without arguments select_related would follow every relation
+        if expand:
+            queryset = queryset.select_related(*expand)
+        return queryset.only(*columns)
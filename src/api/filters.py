@@ -1,9 +1,17 @@
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
 from django_filters import rest_framework as filters
 from django_filters.fields import IsoDateTimeField
 
 from tracker.models import Launch
 
 
+def start_of_day(moment: datetime) -> datetime:
+    local = timezone.localtime(moment) if timezone.is_aware(moment) else moment
+    return timezone.make_aware(datetime.combine(local.date(), time()))
+
+
 class CustomDateFilter(filters.DateFilter):
     field_class = IsoDateTimeField
 
@@ -26,6 +34,24 @@ class LaunchFilter(filters.FilterSet):
     def filter_by_launch_date_lte(self, queryset, name, value):
         return queryset.filter(launch_datetime__date__lte=value)
 
+    def launch_datetime_range(self) -> tuple[datetime | None, datetime | None]:
+        """
+        Bounds of the launch times selected by the valid filters, the start
+        included and the end excluded, or None where unbounded.
+        """
+        data = self.form.cleaned_data
+        starts, ends = [], []
+        if data.get("launch_datetime__gte"):
+            starts.append(data["launch_datetime__gte"])
+        if data.get("launch_datetime__lte"):
+            ends.append(data["launch_datetime__lte"] + timedelta(microseconds=1))
+        # Dates are compared in the current time zone
+        if data.get("launch_date__gte"):
+            starts.append(start_of_day(data["launch_date__gte"]))
+        if data.get("launch_date__lte"):
+            ends.append(start_of_day(data["launch_date__lte"]) + timedelta(days=1))
+        return max(starts, default=None), min(ends, default=None)
+
     class Meta:
         model = Launch
         fields = {
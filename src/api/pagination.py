@@ -0,0 +1,165 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from typing import NamedTuple
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+# Query param switching a view to limit/offset pagination, for older clients
+PAGINATION_QUERY_PARAM = "pagination"
+LIMIT_OFFSET = "offset"
+
+
+class Cursor(NamedTuple):
+    # walking backwards, i.e. towards the previous page
+    reverse: bool
+    # ordering values of the row the page starts after
+    position: tuple
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset pagination: a page is the `limit` rows following the position of the
+    last row of the previous page in `ordering`, found through an index on the
+    ordering fields, so deep pages are as cheap as the first one and no rows
+    are counted. Rows inserted meanwhile don't shift the following pages.
+
+    The ordering must be unique; its last field is typically the primary key.
+    Positions travel in opaque `cursor` params of the next/previous links.
+    """
+
+    ordering: tuple[str, ...] = ()
+    default_limit = api_settings.PAGE_SIZE
+    limit_query_param = "limit"
+    max_limit = 1000
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset: QuerySet, request, view=None) -> list:
+        self.request = request
+        self.model = queryset.model
+        self.limit = self.get_limit(request)
+        self.cursor = self.decode_cursor(request)
+        reverse, position = self.cursor or (False, None)
+
+        order = [f"-{name}" if reverse else name for name in self.ordering]
+        queryset = queryset.order_by(*order)
+        if position is not None:
+            queryset = queryset.filter(self.after(position, reverse))
+
+        # One more row tells whether there is a page beyond this one
+        rows = list(queryset[: self.limit + 1])
+        has_more = len(rows) > self.limit
+        rows = rows[: self.limit]
+        if reverse:
+            rows.reverse()
+
+        self.has_next = position is not None if reverse else has_more
+        self.has_previous = has_more if reverse else position is not None
+        self.rows = rows
+        return rows
+
+    def get_paginated_response(self, data) -> Response:
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_limit(self, request) -> int:
+        try:
+            limit = int(request.query_params[self.limit_query_param])
+        except (KeyError, ValueError):
+            return self.default_limit
+        if limit <= 0:
+            return self.default_limit
+        return min(limit, self.max_limit)
+
+    def after(self, position: tuple, reverse: bool) -> Q:
+        """Rows past `position` in the ordering, or before it when `reverse`."""
+        lookup = "lt" if reverse else "gt"
+        condition = Q()
+        for i, name in enumerate(self.ordering):
+            equal = dict(zip(self.ordering[:i], position[:i]))
+            condition |= Q(**equal, **{f"{name}__{lookup}": position[i]})
+        # Redundant bound on the first field, which lets the DB seek the index
+        # to the position instead of scanning it from the start
+        return Q(**{f"{self.ordering[0]}__{lookup}e": position[0]}) & condition
+
+    def position_of(self, row) -> tuple:
+        # Rows are model instances, or dicts when paginating values()
+        if isinstance(row, dict):
+            return tuple(row[name] for name in self.ordering)
+        return tuple(getattr(row, name) for name in self.ordering)
+
+    def get_next_link(self) -> str | None:
+        if not self.has_next:
+            return None
+        if self.rows:
+            position = self.position_of(self.rows[-1])
+        else:
+            # Empty page walking backwards: continue from where it started
+            position = self.cursor.position
+        return self.link(Cursor(reverse=False, position=position))
+
+    def get_previous_link(self) -> str | None:
+        if not self.has_previous:
+            return None
+        if self.rows:
+            position = self.position_of(self.rows[0])
+        else:
+            position = self.cursor.position
+        return self.link(Cursor(reverse=True, position=position))
+
+    def link(self, cursor: Cursor) -> str:
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(cursor)
+        )
+
+    def encode_cursor(self, cursor: Cursor) -> str:
+        values = [
+            value.isoformat() if hasattr(value, "isoformat") else value
+            for value in cursor.position
+        ]
+        payload = json.dumps([int(cursor.reverse), *values], separators=(",", ":"))
+        return urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, request) -> Cursor | None:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            padding = "=" * (-len(encoded) % 4)
+            reverse, *values = json.loads(urlsafe_b64decode(encoded + padding))
+            if len(values) != len(self.ordering):
+                raise ValueError(encoded)
+            position = tuple(
+                self.model._meta.get_field(name).to_python(value)
+                for name, value in zip(self.ordering, values)
+            )
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return Cursor(reverse=bool(reverse), position=position)
+
+
+class LaunchPagination(KeysetPagination):
+    ordering = ("launch_datetime", "id")
+
+
+def wants_limit_offset(request) -> bool:
+    """Whether a request asks for limit/offset pagination instead of keyset."""
+    params = request.query_params
+    return (
+        params.get(PAGINATION_QUERY_PARAM) == LIMIT_OFFSET
+        or LimitOffsetPagination.offset_query_param in params
+    )
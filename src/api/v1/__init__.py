@@ -1,5 +1,6 @@
 from rest_framework.routers import DefaultRouter
 
+from .cache_stats import ResponseCacheStatsViewSet
 from .launch import LaunchViewSet
 from .stats import LaunchStatsViewSet
 
@@ -7,5 +8,6 @@ router = DefaultRouter()
 
 router.register(r"launches", LaunchViewSet, basename="launch")
 router.register(r"stats", LaunchStatsViewSet, basename="launch-stats")
+router.register(r"cache-stats", ResponseCacheStatsViewSet, basename="cache-stats")
 
 urlpatterns = router.urls
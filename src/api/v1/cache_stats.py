@@ -0,0 +1,11 @@
+from rest_framework import status, viewsets
+from rest_framework.response import Response
+
+from ..cache import response_cache_stats
+
+
+class ResponseCacheStatsViewSet(viewsets.ViewSet):
+    """Hit, miss and invalidation counts of the API response cache."""
+
+    def list(self, request, *args, **kwargs):
+        return Response(response_cache_stats(), status=status.HTTP_200_OK)
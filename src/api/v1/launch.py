@@ -1,17 +1,37 @@
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets
+from rest_framework.pagination import LimitOffsetPagination
 
+from tracker.data_version import LAUNCHES, LAUNCHPADS, ROCKETS
 from tracker.models import Launch
 
-from .serializers import LaunchSerializer
+from ..cache import CachedResponseMixin
+from ..fieldsets import SparseFieldsetViewMixin
 from ..filters import LaunchFilter
+from ..pagination import LaunchPagination, wants_limit_offset
+from ..values import ValuesListMixin
+from .serializers import LaunchSerializer
 
 
-@method_decorator(cache_page(86400), name="dispatch")
-class LaunchViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = Launch.objects.all().select_related("rocket", "launchpad")
+class LaunchViewSet(
+    SparseFieldsetViewMixin,
+    CachedResponseMixin,
+    ValuesListMixin,
+    viewsets.ReadOnlyModelViewSet,
+):
+    cache_scopes = (LAUNCHES, ROCKETS, LAUNCHPADS)
+    queryset = Launch.objects.all().order_by("launch_datetime", "id")
     serializer_class = LaunchSerializer
+    nested_scopes = {"rocket": ROCKETS, "launchpad": LAUNCHPADS}
     filter_backends = [DjangoFilterBackend]
     filterset_class = LaunchFilter
+    pagination_class = LaunchPagination
+    # Keyset pagination reads the ordering of each page's first and last row
+    required_fields = LaunchPagination.ordering
+
+    @property
+    def paginator(self):
+        # Limit/offset pagination is kept for clients written before cursors
+        if not hasattr(self, "_paginator") and wants_limit_offset(self.request):
+            self._paginator = LimitOffsetPagination()
+        return super().paginator
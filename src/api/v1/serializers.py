@@ -2,6 +2,9 @@ from enumfields.drf import EnumSupportSerializerMixin
 from rest_framework import serializers
 
 from tracker.models import Launch, Launchpad, Rocket
+from tracker.timeseries import BUCKETS, GROUPS, MONTH
+
+from ..fieldsets import SparseFieldsetSerializerMixin
 
 
 class RocketSerializer(EnumSupportSerializerMixin, serializers.ModelSerializer):
@@ -42,11 +45,18 @@ class LaunchpadSerializer(EnumSupportSerializerMixin, serializers.ModelSerialize
         read_only_fields = fields
 
 
-class LaunchSerializer(serializers.ModelSerializer):
-    rocket = RocketSerializer()
-    launchpad = LaunchpadSerializer()
+class LaunchSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    # Rendered as ids unless expanded
+    expandable_fields = {"rocket": RocketSerializer, "launchpad": LaunchpadSerializer}
 
     class Meta:
         model = Launch
         fields = ("id", "name", "launch_datetime", "success", "rocket", "launchpad")
         read_only_fields = fields
+
+
+class TimeSeriesParamsSerializer(serializers.Serializer):
+    bucket = serializers.ChoiceField(choices=BUCKETS, default=MONTH)
+    group_by = serializers.ChoiceField(choices=GROUPS, required=False)
+    # Number of buckets rolling figures are computed over
+    window = serializers.IntegerField(min_value=1, max_value=366, default=1)
@@ -1,66 +1,106 @@
-from typing import Any
-
-from django.db.models import Case, Count, F, FloatField, Q, Value, When
-from django.db.models.functions import TruncMonth, TruncYear
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
+from django_filters.rest_framework import DjangoFilterBackend
+from django_filters.utils import translate_validation
 from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from tracker.data_version import STATS
 from tracker.models import Launch
+from tracker.stats import (
+    count_filtered_launches,
+    get_filtered_launch_stats,
+    get_launch_stats,
+)
+from tracker.timeseries import (
+    MONTHLY_BUCKETS,
+    count_launches_by_day,
+    launch_time_series,
+    monthly_to_daily,
+)
+
+from ..cache import CachedResponseMixin
+from ..filters import LaunchFilter
+from .serializers import TimeSeriesParamsSerializer
+
+# Filters of LaunchFilter which launch aggregates can be filtered on as well
+AGGREGATE_FILTERS = ("rocket__name", "launchpad__name", "success")
 
 
-@method_decorator(cache_page(86400), name="dispatch")
-class LaunchStatsViewSet(viewsets.GenericViewSet, mixins.ListModelMixin):
-    queryset = Launch.objects.all().select_related("rocket", "launchpad")
+class LaunchStatsViewSet(
+    CachedResponseMixin, viewsets.GenericViewSet, mixins.ListModelMixin
+):
+    queryset = Launch.objects.all()
+    cache_scopes = (STATS,)
+    cached_actions = ("list", "timeseries")
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = LaunchFilter
 
     def list(self, request, *args, **kwargs):
-        qs = super().get_queryset()
+        filterset, filters = self.get_filters(request)
+        if not filters:
+            # Computed at sync time, see tracker.stats
+            return Response(get_launch_stats(), status=status.HTTP_200_OK)
 
-        # Success rates by rocket
-        rocket_stats = (
-            qs.values("rocket__name")
-            .annotate(
-                total=Count("id"),
-                success_count=Count("id", filter=Q(success=True)),
-            )
-            .annotate(
-                success_rate=Case(
-                    When(total=0, then=Value(0.0)),
-                    default=(F("success_count") * 100.0 / F("total")),
-                    output_field=FloatField(),
+        start, end = filterset.launch_datetime_range()
+        data = get_filtered_launch_stats(
+            filterset.qs, start=start, end=end, **self.aggregate_filters(filters)
+        )
+        return Response(data, status=status.HTTP_200_OK)
+
+    @action(detail=False)
+    def timeseries(self, request, *args, **kwargs):
+        params = TimeSeriesParamsSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        bucket = params.validated_data["bucket"]
+        filterset, filters = self.get_filters(request)
+
+        if bucket in MONTHLY_BUCKETS:
+            start, end = filterset.launch_datetime_range()
+            counts = monthly_to_daily(
+                count_filtered_launches(
+                    filterset.qs,
+                    start=start,
+                    end=end,
+                    **self.aggregate_filters(filters),
                 )
             )
-            .order_by("-total")
-        )
+        else:
+            counts = count_launches_by_day(filterset.qs)
 
-        # Launches per site
-        site_stats = (
-            qs.values("launchpad__name").annotate(total=Count("id")).order_by("-total")
+        data = launch_time_series(
+            counts,
+            bucket=bucket,
+            window=params.validated_data["window"],
+            group_by=params.validated_data.get("group_by"),
         )
+        return Response(data, status=status.HTTP_200_OK)
 
-        # Yearly frequency
-        yearly_stats = (
-            qs.annotate(year=TruncYear("launch_datetime"))
-            .values("year")
-            .annotate(count=Count("id"))
-            .order_by("year")
+    def get_filters(self, request) -> tuple[LaunchFilter, dict]:
+        """The request's filterset and its valid, non empty filters."""
+        filterset = DjangoFilterBackend().get_filterset(
+            request, self.get_queryset(), self
         )
+        if not filterset.is_valid():
+            raise translate_validation(filterset.errors)
+        filters = {
+            name: value
+            for name, value in filterset.form.cleaned_data.items()
+            if value not in (None, "")
+        }
+        return filterset, filters
 
-        # Monthly frequency
-        monthly_stats = (
-            qs.annotate(month=TruncMonth("launch_datetime"))
-            .values("month")
-            .annotate(count=Count("id"))
-            .order_by("month")
-        )
+    @staticmethod
+    def aggregate_filters(filters: dict) -> dict:
+        return {name: filters[name] for name in AGGREGATE_FILTERS if name in filters}
 
-        return Response(
-            {
-                "rocket_success_rates": list(rocket_stats),
-                "launches_per_site": list(site_stats),
-                "yearly_frequency": list(yearly_stats),
-                "monthly_frequency": list(monthly_stats),
-            },
-            status=status.HTTP_200_OK,
-        )
+    def cache_key_params(self, request) -> dict:
+        params = super().cache_key_params(request)
+        if self.action == "timeseries":
+            serializer = TimeSeriesParamsSerializer(data=request.query_params)
+            # Invalid params get a 400 response, which is not cached
+            if serializer.is_valid():
+                for name in serializer.fields:
+                    params.pop(name, None)
+                for name, value in serializer.validated_data.items():
+                    params[name] = [str(value)]
+        return params
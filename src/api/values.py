@@ -0,0 +1,121 @@
+from django.core.cache import cache
+from rest_framework import serializers
+from rest_framework.relations import PKOnlyObject, RelatedField
+from rest_framework.response import Response
+
+from tracker.data_version import get_data_version
+
+SERIALIZED_KEY = "api:serialized:{serializer}:{version}"
+
+
+def serialized_by_id(
+    serializer_class: type[serializers.ModelSerializer], scope: str
+) -> dict:
+    """
+    Every object of the serializer's model serialized, by primary key. Meant
+    for small tables; cached until the version of their data `scope` changes.
+    """
+    key = SERIALIZED_KEY.format(
+        serializer=serializer_class.__name__, version=get_data_version(scope)
+    )
+    serialized = cache.get(key)
+    if serialized is None:
+        model = serializer_class.Meta.model
+        serialized = {
+            obj.pk: dict(serializer_class(obj).data) for obj in model.objects.all()
+        }
+        cache.set(key, serialized, timeout=None)
+    return serialized
+
+
+def serialize_missing(
+    serialized: dict, serializer_class: type[serializers.ModelSerializer], pks
+) -> None:
+    """
+    Add to `serialized_by_id` objects those of `pks` it lacks, e.g. created
+    since it was cached, as processes see version bumps a little late.
+    """
+    missing = set(pks) - serialized.keys() - {None}
+    if missing:
+        model = serializer_class.Meta.model
+        for obj in model.objects.filter(pk__in=missing):
+            serialized[obj.pk] = dict(serializer_class(obj).data)
+
+
+class ValuesSerializer:
+    """
+    Render rows of `QuerySet.values(*columns)` as `serializer` renders model
+    instances, without instantiating models nor binding fields per row. Nested
+    serializers of `serializer` are rendered from `nested`, their serialized
+    objects by primary key.
+    """
+
+    def __init__(self, serializer: serializers.Serializer, nested: dict[str, dict]):
+        self.fields = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if "." in field.source or field.source == "*":
+                raise ValueError(f"Can't render {name} from a column")
+            if name in nested:
+                render = nested[name].__getitem__
+            elif isinstance(field, RelatedField) and field.use_pk_only_optimization():
+                render = self.pk_renderer(field)
+            else:
+                render = field.to_representation
+            self.fields.append((name, field.source, render))
+
+    @staticmethod
+    def pk_renderer(field: RelatedField):
+        return lambda pk: field.to_representation(PKOnlyObject(pk=pk))
+
+    @property
+    def columns(self) -> list[str]:
+        return [source for _, source, _ in self.fields]
+
+    def to_representation(self, row: dict) -> dict:
+        return {
+            name: None if row[source] is None else render(row[source])
+            for name, source, render in self.fields
+        }
+
+
+class ValuesListMixin:
+    """
+    List action of a read-only viewset rendering `QuerySet.values()` rows with a
+    `ValuesSerializer` built from its serializer, i.e. the same data at a
+    fraction of the cost. Nested serializers are rendered from
+    `serialized_by_id`, refreshed along the data scope named for the field in
+    `nested_scopes`, plus the objects of the page missing from it.
+    """
+
+    nested_scopes: dict[str, str] = {}
+    # Columns to load besides the rendered ones, e.g. needed for pagination
+    required_fields: tuple[str, ...] = ()
+
+    def list(self, request, *args, **kwargs):
+        serializer = self.get_serializer()
+        nested_fields = {
+            name: field
+            for name, field in serializer.fields.items()
+            if isinstance(field, serializers.BaseSerializer)
+        }
+        nested = {
+            name: serialized_by_id(type(field), self.nested_scopes[name])
+            for name, field in nested_fields.items()
+        }
+        values_serializer = ValuesSerializer(serializer, nested)
+
+        columns = dict.fromkeys([*values_serializer.columns, *self.required_fields])
+        queryset = self.filter_queryset(self.get_queryset()).values(*columns)
+
+        page = self.paginate_queryset(queryset)
+        rows = list(queryset if page is None else page)
+        for name, field in nested_fields.items():
+            serialize_missing(
+                nested[name], type(field), (row[field.source] for row in rows)
+            )
+        data = [values_serializer.to_representation(row) for row in rows]
+        if page is None:
+            return Response(data)
+        return self.get_paginated_response(data)
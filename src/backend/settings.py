@@ -139,3 +139,42 @@ STATIC_URL = "static/"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 SPACEX_BASE_URL = "https://api.spacexdata.com/v4/"
+
+# HTTP connection pool used by the SpaceX client
+SPACEX_POOL_CONNECTIONS = 10  # number of per-host pools kept
+SPACEX_POOL_MAXSIZE = 10  # max connections kept per host
+SPACEX_KEEP_ALIVE = True
+
+# Timeouts in seconds: connect timeout of each attempt, total budget of a fetch
+SPACEX_CONNECT_TIMEOUT = 3.05
+SPACEX_FETCH_DEADLINE = 300
+
+# Process-wide request rate (per second) and burst allowed towards SpaceX
+SPACEX_RATE_LIMIT = 10
+SPACEX_RATE_BURST = 10
+# Consecutive failed calls opening the circuit breaker, seconds it stays open
+SPACEX_BREAKER_FAILURE_THRESHOLD = 5
+SPACEX_BREAKER_RESET_TIMEOUT = 60
+
+# Documents requested per page from the SpaceX `/{resource}/query` endpoints
+SPACEX_QUERY_PAGE_SIZE = 200
+
+# On-disk cache of SpaceX responses, revalidated with ETag/Last-Modified.
+# Set SPACEX_CACHE_DIR to None to disable it.
+SPACEX_CACHE_DIR = BASE_DIR / ".spacex_cache"
+SPACEX_CACHE_MAX_BYTES = 50 * 1024 * 1024
+
+# Cached API responses are keyed on the versions of the synced data they are
+# built from, which a sync changing that data bumps, so they don't expire.
+# Processes re-read the versions this often (seconds).
+DATA_VERSION_CACHE_TTL = 5
+# max-age sent to clients with API responses
+API_CACHE_CONTROL_MAX_AGE = 60
+
+# Responses pre-rendered into the cache after a sync: the stats, the first
+# pages of launches, these filters and the launches of each rocket, as
+# requested on this host, the one the API is served on, e.g. "api.example.com".
+# It must be allowed by ALLOWED_HOSTS. Unset, responses aren't pre-rendered.
+API_CACHE_WARMUP_HOST = None
+API_CACHE_WARMUP_PAGES = 3
+API_CACHE_WARMUP_FILTERS = [{"success": "true"}, {"success": "false"}]
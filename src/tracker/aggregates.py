@@ -0,0 +1,108 @@
+from collections import Counter
+from datetime import date, datetime
+
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Launch, LaunchAggregate
+
+# Columns of a launch its LaunchAggregate counter is keyed on
+COUNTED_FIELDS = ("rocket_id", "launchpad_id", "launch_datetime", "success")
+
+
+def launch_count_key(
+    rocket_id: str, launchpad_id: str, launch_datetime: datetime, success: bool | None
+) -> tuple:
+    """
+    Key of the counter a launch counts in: (rocket_id, launchpad_id, year,
+    month, success), the month being that of the current time zone.
+    """
+    local = launch_datetime.astimezone(timezone.get_current_timezone())
+    return rocket_id, launchpad_id, local.year, local.month, success
+
+
+def stored_launch_counts() -> Counter:
+    """The LaunchAggregate counters, keyed like `launch_count_key`."""
+    return Counter(
+        {
+            (rocket_id, launchpad_id, month.year, month.month, success): count
+            for rocket_id, launchpad_id, month, success, count in (
+                LaunchAggregate.objects.values_list(
+                    "rocket_id", "launchpad_id", "month", "success", "count"
+                ).iterator()
+            )
+        }
+    )
+
+
+def store_launch_counts(counts: Counter, batch_size: int) -> None:
+    """Replace every LaunchAggregate counter with `counts`."""
+    LaunchAggregate.objects.all().delete()
+    LaunchAggregate.objects.bulk_create(
+        (
+            LaunchAggregate(
+                rocket_id=rocket_id,
+                launchpad_id=launchpad_id,
+                month=date(year, month, 1),
+                success=success,
+                count=count,
+            )
+            for (rocket_id, launchpad_id, year, month, success), count in counts.items()
+            if count
+        ),
+        batch_size=batch_size,
+    )
+
+
+class LaunchCountDeltas:
+    """
+    Changes to the LaunchAggregate counters made by launch writes, gathered as
+    launches are written and applied at once. Pass it to `tracker.sync.upsert`
+    as `observer` to track the launches it inserts and updates.
+    """
+
+    fields = COUNTED_FIELDS
+
+    def __init__(self) -> None:
+        self.deltas = Counter()
+
+    def written(self, previous: dict | None, launch: Launch) -> None:
+        """Track `launch` being written over its `previous` counted fields."""
+        if previous is not None:
+            self.deltas[launch_count_key(**previous)] -= 1
+        self.deltas[
+            launch_count_key(*(getattr(launch, name) for name in COUNTED_FIELDS))
+        ] += 1
+
+    def deleted(self, counts: Counter) -> None:
+        """Track the deletion of launches counted by `tracker.stats.count_launches`."""
+        self.deltas.subtract(counts)
+
+    def apply(self) -> None:
+        """
+        Add the deltas to the counters, an UPDATE per changed counter, plus an
+        INSERT for new ones, and drop the counters down to zero.
+        """
+        for key, delta in self.deltas.items():
+            if not delta:
+                continue
+            rocket_id, launchpad_id, year, month, success = key
+            counter = LaunchAggregate.objects.filter(
+                rocket_id=rocket_id,
+                launchpad_id=launchpad_id,
+                month=date(year, month, 1),
+                success=success,
+            )
+            # Counters of deleted launches may be gone along with their rocket
+            # or launchpad already
+            if not counter.update(count=F("count") + delta) and delta > 0:
+                LaunchAggregate.objects.create(
+                    rocket_id=rocket_id,
+                    launchpad_id=launchpad_id,
+                    month=date(year, month, 1),
+                    success=success,
+                    count=delta,
+                )
+        if any(delta < 0 for delta in self.deltas.values()):
+            LaunchAggregate.objects.filter(count=0).delete()
+        self.deltas.clear()
@@ -0,0 +1,82 @@
+from datetime import datetime
+from typing import Iterable, NamedTuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import DataVersion
+
+# Scopes of synced data, each with its own version so that a sync only
+# invalidates what depends on the data it changed
+LAUNCHES = "launches"
+ROCKETS = "rockets"
+LAUNCHPADS = "launchpads"
+# Launch statistics: launches, plus names of their rockets and launchpads
+STATS = "stats"
+
+SCOPES = (LAUNCHES, ROCKETS, LAUNCHPADS, STATS)
+
+CACHE_KEY = "tracker:data-version:{scope}"
+
+
+class DataState(NamedTuple):
+    version: int
+    # when the version was last bumped, None if it never was
+    updated_at: datetime | None
+
+
+def get_data_states(scopes: Iterable[str]) -> dict[str, DataState]:
+    """
+    Current versions of `scopes`. They are kept in the DB so that every process
+    sees bumps made by the sync command, and cached for
+    `DATA_VERSION_CACHE_TTL` seconds to spare a query per request.
+    """
+    keys = {scope: CACHE_KEY.format(scope=scope) for scope in scopes}
+    cached = cache.get_many(keys.values())
+    states = {
+        scope: DataState(*cached[key]) for scope, key in keys.items() if key in cached
+    }
+
+    missing = [scope for scope in keys if scope not in states]
+    if missing:
+        stored = {
+            scope: DataState(version, updated_at)
+            for scope, version, updated_at in DataVersion.objects.filter(
+                scope__in=missing
+            ).values_list("scope", "version", "updated_at")
+        }
+        loaded = {scope: stored.get(scope, DataState(0, None)) for scope in missing}
+        cache.set_many(
+            {keys[scope]: tuple(state) for scope, state in loaded.items()},
+            settings.DATA_VERSION_CACHE_TTL,
+        )
+        states.update(loaded)
+
+    return {scope: states[scope] for scope in keys}
+
+
+def get_data_versions(scopes: Iterable[str]) -> dict[str, int]:
+    return {scope: state.version for scope, state in get_data_states(scopes).items()}
+
+
+def get_data_version(scope: str) -> int:
+    return get_data_versions([scope])[scope]
+
+
+def bump_data_version(*scopes: str) -> None:
+    """
+    Increment the versions of `scopes`. Inside a transaction the new versions
+    are only published, and the cached ones dropped, once it commits.
+    """
+    with transaction.atomic():
+        for scope in scopes:
+            DataVersion.objects.get_or_create(scope=scope)
+        DataVersion.objects.filter(scope__in=scopes).update(
+            version=F("version") + 1, updated_at=timezone.now()
+        )
+
+    keys = [CACHE_KEY.format(scope=scope) for scope in scopes]
+    transaction.on_commit(lambda: cache.delete_many(keys))
@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.transaction import atomic
+
+from ...aggregates import stored_launch_counts
+from ...data_version import STATS, bump_data_version
+from ...models import Launch
+from ...stats import count_launches, rebuild_launch_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Checks the stats counters, maintained incrementally by syncs, against "
+        "a full recount of the launches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Recount the launches into the counters and rebuild the stats "
+            "if they differ.",
+        )
+
+    def handle(self, *args, **options):
+        expected = count_launches(Launch.objects.all())
+        stored = stored_launch_counts()
+        mismatches = sorted(
+            (
+                (key, stored[key], expected[key])
+                for key in expected.keys() | stored.keys()
+                if stored[key] != expected[key]
+            ),
+            # Outcomes may be None
+            key=lambda mismatch: str(mismatch[0]),
+        )
+        if not mismatches:
+            self.stdout.write(f"Stats counters match: {len(stored)} counters")
+            return
+
+        for key, count, actual in mismatches:
+            rocket_id, launchpad_id, year, month, success = key
+            self.stdout.write(
+                f"{rocket_id} {launchpad_id} {year}-{month:02} success={success}: "
+                f"counted {count}, expected {actual}"
+            )
+        if not options["fix"]:
+            raise CommandError(f"{len(mismatches)} stats counters differ")
+
+        with atomic():
+            bump_data_version(STATS)
+            snapshot = rebuild_launch_stats()
+        self.stdout.write(
+            f"{len(mismatches)} stats counters fixed: stats version "
+            f"{snapshot.data_version}"
+        )
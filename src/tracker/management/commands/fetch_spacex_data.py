@@ -1,11 +1,42 @@
+import time
+from dataclasses import asdict
 from datetime import datetime
+from typing import Iterable, Iterator
 
 import structlog
-from django.core.management.base import BaseCommand
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
 from django.db.transaction import atomic
+from django.utils import timezone
 
-from ...models import Launch, Launchpad, Rocket
+from api.cache import warm_up_api_cache
+
+from ...aggregates import LaunchCountDeltas
+from ...data_version import (
+    LAUNCHES,
+    LAUNCHPADS,
+    ROCKETS,
+    STATS,
+    bump_data_version,
+)
+from ...models import Launch, Launchpad, Rocket, SyncState
 from ...spacex.client import SpaceX
+from ...spacex.dataclasses import LaunchDTO
+from ...spacex.exceptions import CircuitOpenError
+from ...spacex.resilience import CircuitBreaker, Deadline
+from ...spacex.snapshot import SnapshotSpaceX, SnapshotWriter
+from ...stats import update_launch_stats
+from ...sync import (
+    LAUNCH_FIELDS,
+    LAUNCHPAD_FIELDS,
+    ROCKET_FIELDS,
+    SYNC_BATCH_SIZE,
+    SyncResult,
+    launch_from_dto,
+    launchpad_from_dto,
+    rocket_from_dto,
+    upsert,
+)
 
 logger = structlog.get_logger(__name__)
 
@@ -13,107 +44,285 @@ logger = structlog.get_logger(__name__)
 class Command(BaseCommand):
     help = "Fetches SpaceX data and stores it locally in the DB."
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sequential",
+            action="store_true",
+            help="Fetch rockets and launchpads one after another.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=3,
+            help="Number of threads used to fetch rockets and launchpads concurrently.",
+        )
+        parser.add_argument(
+            "--deadline",
+            type=float,
+            default=None,
+            help="Seconds the whole fetch may take (default: SPACEX_FETCH_DEADLINE).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=SYNC_BATCH_SIZE,
+            help="Number of rows read, compared and written to the DB at a time.",
+        )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Fetch every launch instead of only the ones changed since last sync.",
+        )
+        parser.add_argument(
+            "--no-cache",
+            action="store_true",
+            help="Bypass the on-disk cache of SpaceX responses.",
+        )
+        parser.add_argument(
+            "--no-warm-up",
+            action="store_true",
+            help="Don't pre-render the cached API responses after a sync which changed data.",
+        )
+        snapshot = parser.add_mutually_exclusive_group()
+        snapshot.add_argument(
+            "--save-snapshot",
+            metavar="PATH",
+            help="Fetch everything and also write the SpaceX documents to a gzipped NDJSON file.",
+        )
+        snapshot.add_argument(
+            "--from-snapshot",
+            metavar="PATH",
+            help="Load the SpaceX documents from a snapshot file instead of the API.",
+        )
+
     def handle(self, *args, **options):
-        spacex = SpaceX()
-        data = spacex.fetch_data()
-
-        with atomic():
-            # Rockets
-            existing_rockets = set(Rocket.objects.values_list("id", flat=True))
-            new_rockets = [
-                Rocket(
-                    id=r.id,
-                    name=r.name,
-                    mass=r.mass,
-                    type=r.type,
-                    active=r.active,
-                    stages=r.stages,
-                    boosters=r.boosters,
-                    cost_per_launch=r.cost_per_launch,
-                    success_rate_pct=r.success_rate_pct,
-                    first_flight=r.first_flight,
-                    description=r.description,
-                )
-                for r in data["rockets"]
-                if r.id not in existing_rockets
-            ]
-            Rocket.objects.bulk_create(new_rockets)
-
-            logger.info(
-                "Rockets synced",
-                new=len(new_rockets),
-                total=len(existing_rockets) + len(new_rockets),
-            )
+        deadline = options["deadline"]
+        if deadline is None:
+            deadline = settings.SPACEX_FETCH_DEADLINE
+        elif deadline <= 0:
+            raise CommandError("--deadline must be a positive number of seconds.")
+
+        state, _ = SyncState.objects.get_or_create(resource="launches")
+        # Snapshots always hold every launch: saving one needs a full fetch, and
+        # replaying one returns all its launches whatever the query
+        full = (
+            options["full"]
+            or state.watermark is None
+            or options["save_snapshot"]
+            or options["from_snapshot"]
+        )
+
+        logger.info(
+            "Syncing SpaceX launches",
+            mode="full" if full else "incremental",
+            watermark=state.watermark,
+            pending=len(state.pending_ids),
+        )
+
+        if options["from_snapshot"]:
+            spacex = SnapshotSpaceX(options["from_snapshot"])
+        else:
+            spacex = SpaceX(use_cache=not options["no_cache"])
+
+        circuit_breaker = spacex.circuit_breaker
+        if (
+            not options["from_snapshot"]
+            and circuit_breaker.state == CircuitBreaker.OPEN
+        ):
+            self.skip_sync(circuit_breaker.describe())
+            return
+
+        if options["save_snapshot"]:
+            spacex.recorder = SnapshotWriter(options["save_snapshot"])
+
+        launches_query = (
+            {}
+            if full
+            else spacex.changed_launches_query(state.watermark, state.pending_ids)
+        )
+        try:
+            with spacex.deadline_scope(deadline) as budget, atomic():
+                changed = self.sync(spacex, state, launches_query, budget, options)
+        except BaseException as exc:
+            if spacex.recorder is not None:
+                spacex.recorder.discard()
+            if isinstance(exc, CircuitOpenError):
+                self.skip_sync(exc.breaker.describe())
+                return
+            raise
+        if spacex.recorder is not None:
+            spacex.recorder.commit()
+
+        logger.info("SpaceX data fetch completed")
+
+        if changed and not options["no_warm_up"]:
+            warm_up_api_cache()
+
+    def sync(
+        self,
+        spacex: SpaceX,
+        state: SyncState,
+        launches_query: dict,
+        budget: Deadline,
+        options: dict,
+    ) -> bool:
+        """
+        Pipeline of the sync: rockets and launchpads are few and fetched whole,
+        concurrently unless `--sequential`. Launches are then streamed from the
+        API page by page, decoded one at a time and upserted `--batch-size` rows
+        at a time, so memory use does not grow with the number of launches.
+
+        Bumps the versions of the data scopes it changed, invalidating the
+        cached API responses built from them. The stats counters are updated
+        by the changes to launches, and the stats rebuilt from them, if they
+        changed. Returns whether any row was written.
+        """
+        batch_size = options["batch_size"]
+        data = spacex.fetch_data(
+            concurrent=not options["sequential"],
+            max_workers=options["workers"],
+            deadline=budget.remaining(),
+            resources=("rockets", "launchpads"),
+        )
+
+        # Stats show rocket and launchpad names, other fields don't affect them
+        names_before = self.names()
+        rockets = upsert(
+            Rocket, map(rocket_from_dto, data["rockets"]), ROCKET_FIELDS, batch_size
+        )
+        self.log_result("Rockets", rockets)
 
-            # Launchpads
-            existing_launchpads = set(Launchpad.objects.values_list("id", flat=True))
-            new_launchpads = [
-                Launchpad(
-                    id=lp.id,
-                    name=lp.name,
-                    full_name=lp.full_name,
-                    locality=lp.locality,
-                    region=lp.region,
-                    launch_attempts=lp.launch_attempts,
-                    launch_successes=lp.launch_successes,
-                    status=lp.status,
-                    latitude=lp.latitude,
-                    longitude=lp.longitude,
-                    details=lp.details,
-                )
-                for lp in data["launchpads"]
-                if lp.id not in existing_launchpads
-            ]
-            Launchpad.objects.bulk_create(new_launchpads)
-
-            logger.info(
-                "Launchpads synced",
-                new=len(new_launchpads),
-                total=len(existing_launchpads) + len(new_launchpads),
+        launchpads = upsert(
+            Launchpad,
+            map(launchpad_from_dto, data["launchpads"]),
+            LAUNCHPAD_FIELDS,
+            batch_size,
+        )
+        self.log_result("Launchpads", launchpads)
+
+        rocket_ids = set(Rocket.objects.values_list("id", flat=True))
+        launchpad_ids = set(Launchpad.objects.values_list("id", flat=True))
+        progress = SyncProgress(state.watermark)
+        # Changes to the stats counters, applied along with the launches
+        deltas = LaunchCountDeltas()
+        launches = upsert(
+            Launch,
+            (
+                launch_from_dto(l)
+                for l in progress.track(spacex.iter_dtos("launches", launches_query))
+                if self.has_related_objects(l, rocket_ids, launchpad_ids)
+                or progress.retry(l)
+            ),
+            LAUNCH_FIELDS,
+            batch_size,
+            observer=deltas,
+        )
+        logger.info(
+            "SpaceX resource fetched",
+            resource="launches",
+            count=progress.count,
+            duration_ms=round(progress.fetch_duration * 1000, 1),
+        )
+        self.log_result("Launches", launches)
+
+        self.advance_sync_state(state, progress)
+
+        changed_scopes = [
+            scope
+            for scope, changed in (
+                (ROCKETS, rockets.changed),
+                (LAUNCHPADS, launchpads.changed),
+                (LAUNCHES, launches.changed),
+                (STATS, launches.changed or self.names() != names_before),
             )
+            if changed
+        ]
+        if changed_scopes:
+            bump_data_version(*changed_scopes)
+            logger.info("Data versions bumped", scopes=changed_scopes)
+        if STATS in changed_scopes:
+            update_launch_stats(deltas)
+        return bool(changed_scopes)
+
+    @staticmethod
+    def names() -> tuple[dict, dict]:
+        return (
+            dict(Rocket.objects.values_list("id", "name")),
+            dict(Launchpad.objects.values_list("id", "name")),
+        )
 
-            # Launches
-            existing_launches = set(Launch.objects.values_list("id", flat=True))
-
-            # Prefetch related rockets + launchpads into dicts
-            rocket_map = {r.id: r for r in Rocket.objects.all()}
-            launchpad_map = {lp.id: lp for lp in Launchpad.objects.all()}
-
-            new_launches = []
-            for l in data["launches"]:
-                if l.id in existing_launches:
-                    continue
-
-                try:
-                    rocket = rocket_map[l.rocket]
-                    launchpad = launchpad_map[l.launchpad]
-                except KeyError as e:
-                    logger.warning(
-                        f"Skipping launch {l.id}: missing related object {e}"
-                    )
-                    continue
-
-                new_launches.append(
-                    Launch(
-                        id=l.id,
-                        name=l.name,
-                        launch_datetime=datetime.fromisoformat(
-                            l.date_utc.replace("Z", "+00:00")
-                        ),
-                        upcoming=l.upcoming,
-                        success=l.success,
-                        rocket=rocket,
-                        launchpad=launchpad,
-                        details=l.details,
-                    )
-                )
-
-            Launch.objects.bulk_create(new_launches)
-
-            logger.info(
-                "Launches synced",
-                new=len(new_launches),
-                total=len(existing_launches) + len(new_launches),
+    @staticmethod
+    def has_related_objects(l, rocket_ids: set, launchpad_ids: set) -> bool:
+        missing = [
+            f"{name} {value}"
+            for name, value, ids in (
+                ("rocket", l.rocket, rocket_ids),
+                ("launchpad", l.launchpad, launchpad_ids),
             )
+            if value not in ids
+        ]
+        if missing:
+            logger.warning(
+                f"Skipping launch {l.id}: missing related object {', '.join(missing)}"
+            )
+        return not missing
+
+    @staticmethod
+    def log_result(label: str, result: SyncResult) -> None:
+        logger.info(f"{label} synced", changed=result.changed, **asdict(result))
+
+    def skip_sync(self, reason: str) -> None:
+        logger.warning("SpaceX sync skipped", reason=reason)
+        self.stderr.write(f"SpaceX sync skipped: {reason}")
+
+    @staticmethod
+    def advance_sync_state(state: SyncState, progress: "SyncProgress") -> None:
+        """
+        Move the watermark to the newest launch which already happened and keep
+        the still upcoming ones and the skipped ones, so that next sync asks only
+        for what changed or wasn't written.
+        """
+        state.watermark = progress.watermark
+        state.pending_ids = progress.pending_ids
+        state.synced_at = timezone.now()
+        state.save()
+
+        logger.info(
+            "Sync state saved",
+            watermark=state.watermark,
+            pending=len(state.pending_ids),
+            launches=progress.count,
+        )
+
+
+class SyncProgress:
+    """Sync state gathered from launches as they stream past."""
+
+    def __init__(self, watermark: datetime | None) -> None:
+        self.watermark = watermark
+        self.pending_ids: list[str] = []
+        self.count = 0
+        # Seconds spent waiting on the stream of launches, not writing them
+        self.fetch_duration = 0.0
+
+    def track(self, launches: Iterable[LaunchDTO]) -> Iterator[LaunchDTO]:
+        start = time.perf_counter()
+        for l in launches:
+            self.fetch_duration += time.perf_counter() - start
+            self.count += 1
+            if l.upcoming:
+                self.pending_ids.append(l.id)
+            elif self.watermark is None or l.date_utc > self.watermark:
+                self.watermark = l.date_utc
+            yield l
+            start = time.perf_counter()
+        self.fetch_duration += time.perf_counter() - start
 
-            logger.info("SpaceX data fetch completed")
+    def retry(self, l: LaunchDTO) -> bool:
+        """
+        Keep a launch which wasn't written pending, as the watermark may move
+        past it. Returns False, to filter the launch out.
+        """
+        if not l.upcoming:
+            self.pending_ids.append(l.id)
+        return False
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from django.db.transaction import atomic
+
+from ...data_version import STATS, bump_data_version
+from ...stats import rebuild_launch_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Recounts every launch into the stats counters and rebuilds the launch "
+        "statistics snapshot served by the stats API."
+    )
+
+    def handle(self, *args, **options):
+        # The snapshot may differ from the one cached responses were built from
+        with atomic():
+            bump_data_version(STATS)
+            snapshot = rebuild_launch_stats()
+
+        self.stdout.write(
+            f"Stats snapshot rebuilt: version {snapshot.data_version}, "
+            f"{snapshot.build_duration:.3f}s"
+        )
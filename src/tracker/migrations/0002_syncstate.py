@@ -0,0 +1,25 @@
+# Generated by Django 5.0 on 2026-10-18 17:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracker", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SyncState",
+            fields=[
+                (
+                    "resource",
+                    models.CharField(max_length=64, primary_key=True, serialize=False),
+                ),
+                ("watermark", models.DateTimeField(blank=True, null=True)),
+                ("pending_ids", models.JSONField(blank=True, default=list)),
+                ("synced_at", models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.0 on 2026-10-18 17:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracker", "0002_syncstate"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="launch",
+            name="fingerprint",
+            field=models.CharField(default="", editable=False, max_length=32),
+        ),
+        migrations.AddField(
+            model_name="launchpad",
+            name="fingerprint",
+            field=models.CharField(default="", editable=False, max_length=32),
+        ),
+        migrations.AddField(
+            model_name="rocket",
+            name="fingerprint",
+            field=models.CharField(default="", editable=False, max_length=32),
+        ),
+    ]
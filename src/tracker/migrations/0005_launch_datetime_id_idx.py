@@ -0,0 +1,19 @@
+# Generated by Django 5.0 on 2026-10-18 17:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracker", "0004_dataversion"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="launch",
+            index=models.Index(
+                fields=["launch_datetime", "id"], name="launch_datetime_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.0 on 2026-10-18 17:51
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracker", "0005_launch_datetime_id_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StatsSnapshot",
+            fields=[
+                (
+                    "name",
+                    models.CharField(max_length=64, primary_key=True, serialize=False),
+                ),
+                (
+                    "data",
+                    models.JSONField(
+                        encoder=django.core.serializers.json.DjangoJSONEncoder
+                    ),
+                ),
+                ("data_version", models.PositiveBigIntegerField(default=0)),
+                ("built_at", models.DateTimeField()),
+                ("build_duration", models.FloatField()),
+            ],
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.0 on 2026-10-18 18:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracker", "0006_statssnapshot"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LaunchAggregate",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("month", models.DateField()),
+                ("success", models.BooleanField(blank=True, default=None, null=True)),
+                ("count", models.PositiveIntegerField()),
+                (
+                    "launchpad",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="tracker.launchpad",
+                    ),
+                ),
+                (
+                    "rocket",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="tracker.rocket",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="launchaggregate",
+            constraint=models.UniqueConstraint(
+                fields=("month", "rocket", "launchpad", "success"),
+                name="launch_aggregate_unique_bucket",
+            ),
+        ),
+    ]
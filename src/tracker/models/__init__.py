@@ -1,3 +1,7 @@
+from .data_version import DataVersion
 from .launch import Launch
+from .launch_aggregate import LaunchAggregate
 from .launchpad import Launchpad
 from .rocket import Rocket
+from .stats_snapshot import StatsSnapshot
+from .sync_state import SyncState
@@ -0,0 +1,10 @@
+from django.db import models
+
+
+class DataVersion(models.Model):
+    # part of the synced data the version is about, see tracker.data_version
+    scope = models.CharField(primary_key=True, max_length=64)
+
+    # bumped by every sync which changed data of the scope
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
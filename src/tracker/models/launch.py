@@ -1,9 +1,27 @@
-from django.db import models
+from django.db import models, transaction
 
 from .launchpad import Launchpad
 from .rocket import Rocket
 
 
+class LaunchQuerySet(models.QuerySet):
+    def delete(self):
+        """
+        Delete the launches and take them out of the stats counters, counted
+        in one pass before the delete. Launches deleted along with their rocket
+        or launchpad take their counters with them.
+        """
+        # tracker.stats imports the models
+        from ..stats import count_launches, uncount_launches
+
+        with transaction.atomic():
+            counts = count_launches(self)
+            deleted, rows = super().delete()
+            if deleted:
+                uncount_launches(counts)
+        return deleted, rows
+
+
 class Launch(models.Model):
     # id from SpaceX API
     id = models.CharField(primary_key=True, max_length=64, unique=True, db_index=True)
@@ -25,3 +43,20 @@ class Launch(models.Model):
     )
 
     details = models.TextField(default="", null=True, blank=True)
+
+    # hash of the fields synced from SpaceX, see tracker.sync.fingerprint
+    fingerprint = models.CharField(max_length=32, default="", editable=False)
+
+    objects = LaunchQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # keyset pagination of the API walks launches in this order
+            models.Index(
+                fields=["launch_datetime", "id"], name="launch_datetime_id_idx"
+            ),
+        ]
+
+    def delete(self, using=None, keep_parents=False):
+        # Through the queryset, which updates the stats counters
+        return type(self).objects.using(using).filter(pk=self.pk).delete()
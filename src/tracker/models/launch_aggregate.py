@@ -0,0 +1,25 @@
+from django.db import models
+
+from .launchpad import Launchpad
+from .rocket import Rocket
+
+
+class LaunchAggregate(models.Model):
+    """Number of launches of a rocket from a launchpad in a month, by outcome."""
+
+    rocket = models.ForeignKey(Rocket, on_delete=models.CASCADE, related_name="+")
+    launchpad = models.ForeignKey(Launchpad, on_delete=models.CASCADE, related_name="+")
+
+    # first day of the month, in the current time zone
+    month = models.DateField()
+    success = models.BooleanField(default=None, null=True, blank=True)
+
+    count = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["month", "rocket", "launchpad", "success"],
+                name="launch_aggregate_unique_bucket",
+            ),
+        ]
@@ -27,3 +27,6 @@ class Launchpad(models.Model):
     status = EnumField(LaunchpadStatus, max_length=55, default=LaunchpadStatus.ACTIVE)
 
     details = models.TextField(default="", null=True, blank=True)
+
+    # hash of the fields synced from SpaceX, see tracker.sync.fingerprint
+    fingerprint = models.CharField(max_length=32, default="", editable=False)
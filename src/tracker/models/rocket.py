@@ -26,3 +26,6 @@ class Rocket(models.Model):
     type = EnumField(RocketType, max_length=50, null=False, blank=False)
 
     description = models.TextField(default="", null=True, blank=True)
+
+    # hash of the fields synced from SpaceX, see tracker.sync.fingerprint
+    fingerprint = models.CharField(max_length=32, default="", editable=False)
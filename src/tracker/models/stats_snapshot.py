@@ -0,0 +1,16 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+
+class StatsSnapshot(models.Model):
+    # name of the statistics, see tracker.stats
+    name = models.CharField(primary_key=True, max_length=64)
+
+    # statistics as served by the API
+    data = models.JSONField(encoder=DjangoJSONEncoder)
+
+    # version of the stats data scope the snapshot was built from
+    data_version = models.PositiveBigIntegerField(default=0)
+    built_at = models.DateTimeField()
+    # seconds the build took
+    build_duration = models.FloatField()
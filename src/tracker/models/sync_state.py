@@ -0,0 +1,13 @@
+from django.db import models
+
+
+class SyncState(models.Model):
+    # name of the synced SpaceX resource, e.g. "launches"
+    resource = models.CharField(primary_key=True, max_length=64)
+
+    # newest date_utc of a launch which is no longer upcoming
+    watermark = models.DateTimeField(null=True, blank=True)
+    # ids of launches which were still upcoming, so still changing, at last sync
+    pending_ids = models.JSONField(default=list, blank=True)
+
+    synced_at = models.DateTimeField(null=True, blank=True)
@@ -0,0 +1,116 @@
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass
+class CachedResponse:
+    etag: str | None
+    last_modified: str | None
+    payload: Any
+
+    @property
+    def validators(self) -> dict:
+        """Headers making the request conditional on the cached representation."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    Persistent cache of parsed JSON responses, one file per request keyed by
+    method, URL and body. Files are evicted least recently used first once the
+    directory grows over `max_bytes`.
+    """
+
+    def __init__(self, directory: str | Path, max_bytes: int) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def key(method: str, url: str, data: dict | None = None) -> str:
+        raw = json.dumps([method.upper(), url, data], sort_keys=True)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> CachedResponse | None:
+        try:
+            with open(self.path(key), encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            logger.warning("Discarding corrupt response cache entry", key=key)
+            self.delete(key)
+            return None
+
+        return CachedResponse(
+            etag=entry.get("etag"),
+            last_modified=entry.get("last_modified"),
+            payload=entry.get("payload"),
+        )
+
+    def set(self, key: str, response: CachedResponse) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        # Write to a temporary file first so readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "etag": response.etag,
+                        "last_modified": response.last_modified,
+                        "payload": response.payload,
+                    },
+                    f,
+                )
+            os.replace(tmp_path, self.path(key))
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+        self.evict()
+
+    def touch(self, key: str) -> None:
+        """Mark an entry as recently used."""
+        try:
+            self.path(key).touch()
+        except FileNotFoundError:
+            pass
+
+    def delete(self, key: str) -> None:
+        self.path(key).unlink(missing_ok=True)
+
+    def evict(self) -> None:
+        entries = []
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(".json"):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            Path(path).unlink(missing_ok=True)
+            total -= size
+            logger.debug("Evicted response cache entry", path=path)
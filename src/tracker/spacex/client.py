@@ -1,65 +1,302 @@
+import threading
 import time
-from typing import List
-from urllib.parse import urljoin
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterator, List, Sequence
+from urllib.parse import urljoin, urlsplit
 
 import requests
 import structlog
 from django.conf import settings
-from requests import ConnectionError, RequestException, Response, Timeout
+from requests import HTTPError, RequestException, Response
+from requests.adapters import HTTPAdapter
 
+from .cache import CachedResponse, ResponseCache
 from .dataclasses import LaunchDTO, LaunchpadDTO, RocketDTO
+from .exceptions import APICallCancelled, CircuitOpenError, DeadlineExceeded
+from .resilience import (
+    CircuitBreaker,
+    Deadline,
+    TokenBucket,
+    backoff_with_jitter,
+    parse_retry_after,
+)
+from .streaming import iter_json_array
 
 logger = structlog.get_logger(__name__)
 
 
 class ThirdPartyAPI:
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+    STREAM_CHUNK_SIZE = 64 * 1024
+
+    # Sessions are shared process-wide per pool configuration, so every client
+    # instance (and every sync run in the same process) reuses warm connections.
+    _sessions: dict[tuple, requests.Session] = {}
+    _sessions_lock = threading.Lock()
+
+    # Rate limiters and circuit breakers are shared process-wide per host, so
+    # every client and sync worker calling a host draws on the same budget
+    _rate_limiters: dict[str, TokenBucket] = {}
+    _circuit_breakers: dict[str, CircuitBreaker] = {}
+    _guards_lock = threading.Lock()
+
     def __init__(
-        self, max_retries: int = 3, base_backoff: int = 2, timeout: int = 10
+        self,
+        max_retries: int = 3,
+        base_backoff: int = 2,
+        timeout: int = 10,
+        connect_timeout: float | None = None,
+        max_backoff: float = 30,
+        pool_connections: int | None = None,
+        pool_maxsize: int | None = None,
+        keep_alive: bool | None = None,
+        session: requests.Session | None = None,
+        use_cache: bool = True,
     ) -> None:
         self.max_retries = max_retries
         self.base_backoff = base_backoff
+        # read timeout of every attempt
         self.timeout = timeout
+        self.connect_timeout = (
+            connect_timeout
+            if connect_timeout is not None
+            else settings.SPACEX_CONNECT_TIMEOUT
+        )
+        self.max_backoff = max_backoff
+        # Total time budget shared by the calls of a batch, see `deadline_scope`
+        self.deadline = Deadline(None)
+
+        self.pool_connections = (
+            pool_connections
+            if pool_connections is not None
+            else settings.SPACEX_POOL_CONNECTIONS
+        )
+        self.pool_maxsize = (
+            pool_maxsize if pool_maxsize is not None else settings.SPACEX_POOL_MAXSIZE
+        )
+        self.keep_alive = (
+            keep_alive if keep_alive is not None else settings.SPACEX_KEEP_ALIVE
+        )
+        self.session = session or self.get_session(
+            self.pool_connections, self.pool_maxsize, self.keep_alive
+        )
+        # Set to abandon in-flight calls, e.g. when a sibling concurrent fetch failed
+        self.cancel_event = threading.Event()
+
+        self.response_cache = None
+        if use_cache and settings.SPACEX_CACHE_DIR:
+            self.response_cache = ResponseCache(
+                settings.SPACEX_CACHE_DIR, settings.SPACEX_CACHE_MAX_BYTES
+            )
+
+    @classmethod
+    def build_session(
+        cls, pool_connections: int, pool_maxsize: int, keep_alive: bool
+    ) -> requests.Session:
+        """
+        Build a session whose adapter keeps up to `pool_connections` host pools,
+        each holding up to `pool_maxsize` connections. Retries are handled by
+        `api_call`, so urllib3 retries are disabled.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=0,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers["Connection"] = "keep-alive" if keep_alive else "close"
+        return session
+
+    @classmethod
+    def get_session(
+        cls, pool_connections: int, pool_maxsize: int, keep_alive: bool
+    ) -> requests.Session:
+        key = (pool_connections, pool_maxsize, keep_alive)
+        with cls._sessions_lock:
+            session = cls._sessions.get(key)
+            if session is None:
+                session = cls.build_session(*key)
+                cls._sessions[key] = session
+            return session
+
+    @classmethod
+    def close_sessions(cls) -> None:
+        with cls._sessions_lock:
+            for session in cls._sessions.values():
+                session.close()
+            cls._sessions.clear()
+
+    @classmethod
+    def rate_limiter_for(cls, url: str) -> TokenBucket:
+        host = urlsplit(url).netloc
+        with cls._guards_lock:
+            if host not in cls._rate_limiters:
+                cls._rate_limiters[host] = TokenBucket(
+                    settings.SPACEX_RATE_LIMIT, settings.SPACEX_RATE_BURST
+                )
+            return cls._rate_limiters[host]
+
+    @classmethod
+    def circuit_breaker_for(cls, url: str) -> CircuitBreaker:
+        host = urlsplit(url).netloc
+        with cls._guards_lock:
+            if host not in cls._circuit_breakers:
+                cls._circuit_breakers[host] = CircuitBreaker(
+                    settings.SPACEX_BREAKER_FAILURE_THRESHOLD,
+                    settings.SPACEX_BREAKER_RESET_TIMEOUT,
+                )
+            return cls._circuit_breakers[host]
+
+    @classmethod
+    def reset_guards(cls) -> None:
+        with cls._guards_lock:
+            cls._rate_limiters.clear()
+            cls._circuit_breakers.clear()
 
     def api_call(
         self,
         url: str,
         method: str = "post",
         data: dict = None,
+        headers: dict | None = None,
+        stream: bool = False,
     ) -> Response:
-        extra_args = {}
+        """
+        Send a request, retrying connection errors, timeouts and retryable
+        statuses with jittered exponential backoff or the server's
+        `Retry-After`. Every attempt gets its own connect/read timeouts, capped
+        by the deadline of the running batch, and no attempt is started which
+        that deadline can't cover.
+
+        Attempts are throttled by the host's rate limiter and refused with
+        `CircuitOpenError` while the host's circuit breaker is open.
+        """
+        extra_args = {"headers": headers, "stream": stream}
         if method == "post":
-            extra_args = {"json": data}
+            extra_args["json"] = data
+
+        deadline = self.deadline
+        rate_limiter = self.rate_limiter_for(url)
+        circuit_breaker = self.circuit_breaker_for(url)
+        attempt = 0
+        while True:
+            if self.cancel_event.is_set():
+                raise APICallCancelled(f"Call to {url} cancelled")
+            if deadline.expired:
+                raise DeadlineExceeded(f"Deadline passed before calling {url}")
+            if not rate_limiter.acquire(
+                timeout=deadline.remaining(), sleep=self.cancel_event.wait
+            ):
+                raise DeadlineExceeded(f"Rate limit leaves no time to call {url}")
+            if self.cancel_event.is_set():
+                raise APICallCancelled(f"Call to {url} cancelled")
+            if not circuit_breaker.allow_request():
+                raise CircuitOpenError(url, circuit_breaker)
 
-        retries = 0
-        while retries <= self.max_retries:
+            remaining = deadline.remaining()
+            timeout = (
+                min(self.connect_timeout, remaining),
+                min(self.timeout, remaining),
+            )
+            retry_after = None
+            start = time.perf_counter()
             try:
-                response = getattr(requests, method)(
+                response = self.session.request(
+                    method.upper(),
                     url,
+                    timeout=timeout,
                     **extra_args,
                 )
-                return response
             except RequestException as exc:
-                wait_time = 2**retries
-                logger.error(
-                    f"Error fetching {url}: {exc}. Retry {retries + 1}/{self.max_retries} in {wait_time}s"
-                )
-                time.sleep(wait_time)
+                error = exc
             except ValueError as exc:
+                circuit_breaker.release()
                 logger.error(f"Value error in {url}: {exc}")
                 raise
-            except (Timeout, ConnectionError) as exc:
-                wait_time = self.base_backoff**retries
-                logger.warning(
-                    f"Transient error calling {url}: {exc}. Retry {retries + 1}/{self.max_retries} in {wait_time}s"
+            else:
+                duration_ms = round((time.perf_counter() - start) * 1000, 1)
+                if response.status_code not in self.RETRY_STATUSES:
+                    circuit_breaker.record_success()
+                    logger.debug(
+                        "API call attempt",
+                        url=url,
+                        attempt=attempt + 1,
+                        status=response.status_code,
+                        duration_ms=duration_ms,
+                    )
+                    return response
+                error = HTTPError(
+                    f"{response.status_code} response from {url}", response=response
                 )
-                time.sleep(wait_time)
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
 
-            retries += 1
-            if retries >= self.max_retries:
+            circuit_breaker.record_failure(error)
+            attempt += 1
+            logger.warning(
+                "API call attempt failed",
+                url=url,
+                attempt=attempt,
+                error=str(error),
+                duration_ms=round((time.perf_counter() - start) * 1000, 1),
+            )
+            if attempt > self.max_retries:
                 logger.error(f"Max retries reached for {url}. Failing permanently.")
-                raise
+                raise error
+            # Fail fast rather than sleep towards a call the breaker would refuse
+            if circuit_breaker.state == CircuitBreaker.OPEN:
+                raise CircuitOpenError(url, circuit_breaker) from error
 
-        raise RuntimeError("api_call failed unexpectedly")
+            wait_time = (
+                retry_after
+                if retry_after is not None
+                else backoff_with_jitter(attempt, self.base_backoff, self.max_backoff)
+            )
+            # Give up now rather than sleep into a deadline the retry can't meet
+            if deadline.remaining() < wait_time + self.connect_timeout:
+                raise DeadlineExceeded(
+                    f"No time left to retry {url} in {wait_time:.1f}s "
+                    f"({deadline.remaining():.1f}s remaining)"
+                ) from error
+
+            logger.info(
+                f"Retry {attempt}/{self.max_retries} for {url} in {wait_time:.1f}s"
+            )
+            self.cancel_event.wait(wait_time)
+
+    def stream_json_items(
+        self,
+        url: str,
+        method: str = "post",
+        data: dict = None,
+        key: str | None = None,
+        meta: dict | None = None,
+    ) -> Iterator:
+        """
+        Yield the elements of the JSON array in the response (or in its `key`
+        member, see `iter_json_array`) while the body is still downloading.
+        """
+        response = self.api_call(url, method, data, stream=True)
+        try:
+            response.raise_for_status()
+            yield from iter_json_array(
+                response.iter_content(chunk_size=self.STREAM_CHUNK_SIZE), key, meta
+            )
+        finally:
+            response.close()
+
+    @contextmanager
+    def deadline_scope(self, seconds: float | None) -> Iterator[Deadline]:
+        """Bound the total time of every call made inside the block."""
+        previous = self.deadline
+        self.deadline = Deadline(seconds)
+        try:
+            yield self.deadline
+        finally:
+            self.deadline = previous
 
     def get_json_data(
         self,
@@ -67,75 +304,252 @@ class ThirdPartyAPI:
         method: str = "post",
         data: dict = None,
     ) -> dict:
-        return self.api_call(url, method, data).json()
+        """
+        Call the API and decode the JSON response. With the response cache
+        enabled the call is conditional on the cached validators, and the cached
+        payload is reused instead of parsing the body again when the server
+        answers 304 or sends back the same ETag.
+        """
+        if self.response_cache is None:
+            return self.api_call(url, method, data).json()
+
+        key = self.response_cache.key(method, url, data)
+        cached = self.response_cache.get(key)
+
+        response = self.api_call(
+            url, method, data, headers=cached.validators if cached else None
+        )
+        etag = response.headers.get("ETag")
+        if cached and (response.status_code == 304 or (etag and etag == cached.etag)):
+            logger.debug(
+                "Reusing cached response", url=url, status=response.status_code
+            )
+            self.response_cache.touch(key)
+            return cached.payload
+
+        payload = response.json()
+        last_modified = response.headers.get("Last-Modified")
+        if response.ok and (etag or last_modified):
+            self.response_cache.set(
+                key,
+                CachedResponse(etag=etag, last_modified=last_modified, payload=payload),
+            )
+        return payload
 
 
 class SpaceX(ThirdPartyAPI):
     BASE_URL = settings.SPACEX_BASE_URL
+    RESOURCES = ("launches", "rockets", "launchpads")
 
-    def fetch_launches(self) -> List[LaunchDTO]:
-        url = urljoin(self.BASE_URL, "launches")
-        data = super().get_json_data(url, "get", None)
-
-        return [
-            LaunchDTO(
-                id=item.get("id"),
-                name=item.get("name"),
-                date_utc=item.get("date_utc"),
-                upcoming=item.get("upcoming"),
-                success=item.get("success"),
-                rocket=item.get("rocket"),
-                launchpad=item.get("launchpad"),
-                details=item.get("details"),
-            )
-            for item in data
-        ]
-
-    def fetch_rockets(self) -> List[RocketDTO]:
-        url = urljoin(self.BASE_URL, "rockets")
-        data = super().get_json_data(url, "get", None)
-
-        return [
-            RocketDTO(
-                id=item.get("id"),
-                name=item.get("name"),
-                mass=item.get("mass", {}).get("kg"),
-                type=item.get("type"),
-                active=item.get("active"),
-                stages=item.get("stages"),
-                boosters=item.get("boosters"),
-                cost_per_launch=item.get("cost_per_launch"),
-                success_rate_pct=item.get("success_rate_pct"),
-                first_flight=item.get("first_flight"),
-                description=item.get("description", ""),
+    # DTO decoded from each document of a resource, its projection is derived from it
+    RESOURCE_DTOS = {
+        "launches": LaunchDTO,
+        "rockets": RocketDTO,
+        "launchpads": LaunchpadDTO,
+    }
+    # Stable ordering so that pages don't overlap or skip documents
+    RESOURCE_SORT = {
+        "launches": {"date_utc": "asc", "_id": "asc"},
+        "rockets": {"_id": "asc"},
+        "launchpads": {"_id": "asc"},
+    }
+
+    def __init__(self, *args, page_size: int | None = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.page_size = page_size or settings.SPACEX_QUERY_PAGE_SIZE
+        # Receives every raw document before it is decoded, see `SnapshotWriter`
+        self.recorder = None
+
+    @property
+    def circuit_breaker(self) -> CircuitBreaker:
+        return self.circuit_breaker_for(self.BASE_URL)
+
+    @staticmethod
+    def select_fields(dto_class: type) -> dict:
+        return {field: 1 for field in dto_class._fields}
+
+    def query_body(
+        self,
+        resource: str,
+        query: dict | None = None,
+        page_size: int | None = None,
+        page: int = 1,
+    ) -> dict:
+        return {
+            "query": query or {},
+            "options": {
+                "select": self.select_fields(self.RESOURCE_DTOS[resource]),
+                "sort": self.RESOURCE_SORT[resource],
+                "limit": page_size or self.page_size,
+                "page": page,
+                "pagination": True,
+            },
+        }
+
+    def query_pages(
+        self, resource: str, query: dict | None = None, page_size: int | None = None
+    ) -> Iterator[List[dict]]:
+        """
+        Page through `POST /{resource}/query`, yielding the raw documents of each
+        page as soon as it arrives. Only the fields used by the resource's DTO
+        are requested.
+        """
+        url = urljoin(self.BASE_URL, f"{resource}/query")
+
+        page = 1
+        while page:
+            data = self.get_json_data(
+                url, "post", self.query_body(resource, query, page_size, page)
             )
-            for item in data
-        ]
-
-    def fetch_launchpads(self) -> List[LaunchpadDTO]:
-        url = urljoin(self.BASE_URL, "launchpads")
-        data = super().get_json_data(url, "get", None)
-
-        return [
-            LaunchpadDTO(
-                id=item.get("id"),
-                name=item.get("name"),
-                full_name=item.get("full_name"),
-                locality=item.get("locality"),
-                region=item.get("region"),
-                launch_attempts=item.get("launch_attempts"),
-                launch_successes=item.get("launch_successes"),
-                status=item.get("status"),
-                latitude=item.get("latitude"),
-                longitude=item.get("longitude"),
-                details=item.get("details", ""),
+            yield data["docs"]
+            page = data.get("nextPage") if data.get("hasNextPage") else None
+
+    def stream_query_docs(
+        self, resource: str, query: dict | None = None, page_size: int | None = None
+    ) -> Iterator[dict]:
+        """
+        Like `query_pages`, but yields documents one at a time, each decoded as
+        soon as its bytes arrive, so no page is ever held in memory as a whole.
+        Streamed responses don't go through the response cache.
+        """
+        url = urljoin(self.BASE_URL, f"{resource}/query")
+
+        page = 1
+        while page:
+            meta = {}
+            yield from self.stream_json_items(
+                url,
+                "post",
+                self.query_body(resource, query, page_size, page),
+                key="docs",
+                meta=meta,
             )
-            for item in data
-        ]
+            page = meta.get("nextPage") if meta.get("hasNextPage") else None
+
+    def iter_pages(
+        self, resource: str, query: dict | None = None, page_size: int | None = None
+    ) -> Iterator[list]:
+        build = self.RESOURCE_DTOS[resource].from_api
+        for docs in self.query_pages(resource, query, page_size):
+            if self.recorder is not None:
+                for item in docs:
+                    self.recorder.write(resource, item)
+            yield [build(item) for item in docs]
+
+    def iter_dtos(
+        self, resource: str, query: dict | None = None, page_size: int | None = None
+    ) -> Iterator:
+        build = self.RESOURCE_DTOS[resource].from_api
+        for item in self.stream_query_docs(resource, query, page_size):
+            if self.recorder is not None:
+                self.recorder.write(resource, item)
+            yield build(item)
+
+    @staticmethod
+    def changed_launches_query(
+        watermark: datetime | None, pending_ids: List[str]
+    ) -> dict:
+        """
+        Query matching launches that may have changed since a sync which saw
+        every launch up to `watermark`: newer launches, launches still
+        upcoming and the ones which were upcoming at that sync.
+        """
+        if watermark is None:
+            return {}
 
-    def fetch_data(self):
         return {
-            "launches": self.fetch_launches(),
-            "rockets": self.fetch_rockets(),
-            "launchpads": self.fetch_launchpads(),
+            "$or": [
+                {"date_utc": {"$gt": watermark.isoformat().replace("+00:00", "Z")}},
+                {"upcoming": True},
+                {"_id": {"$in": pending_ids}},
+            ]
         }
+
+    def fetch_launches(self, query: dict | None = None) -> List[LaunchDTO]:
+        return list(self.iter_dtos("launches", query))
+
+    def fetch_rockets(self, query: dict | None = None) -> List[RocketDTO]:
+        return [dto for page in self.iter_pages("rockets", query) for dto in page]
+
+    def fetch_launchpads(self, query: dict | None = None) -> List[LaunchpadDTO]:
+        return [dto for page in self.iter_pages("launchpads", query) for dto in page]
+
+    def fetch_resource(self, resource: str, query: dict | None = None) -> list:
+        start = time.perf_counter()
+        result = getattr(self, f"fetch_{resource}")(query)
+        logger.info(
+            "SpaceX resource fetched",
+            resource=resource,
+            count=len(result),
+            duration_ms=round((time.perf_counter() - start) * 1000, 1),
+        )
+        return result
+
+    def fetch_data(
+        self,
+        concurrent: bool = False,
+        max_workers: int | None = None,
+        queries: dict | None = None,
+        deadline: float | None = None,
+        resources: Sequence[str] | None = None,
+    ):
+        """
+        Fetch `resources` (default: launches, rockets and launchpads), each
+        filtered by its entry in `queries` if there is one. With `concurrent=True` the resources are
+        fetched on a thread pool of `max_workers` threads; if one of them fails,
+        pending fetches are cancelled, running ones are told to stop and the
+        first error is raised once every worker has finished.
+
+        All calls share a total budget of `deadline` seconds, which defaults to
+        `SPACEX_FETCH_DEADLINE`.
+        """
+        self.cancel_event.clear()
+        queries = queries or {}
+        if deadline is None:
+            deadline = settings.SPACEX_FETCH_DEADLINE
+
+        with self.deadline_scope(deadline):
+            return self._fetch_resources(
+                concurrent, max_workers, queries, resources or self.RESOURCES
+            )
+
+    def _fetch_resources(
+        self,
+        concurrent: bool,
+        max_workers: int | None,
+        queries: dict,
+        resources: Sequence[str],
+    ) -> dict:
+        if not concurrent:
+            return {
+                resource: self.fetch_resource(resource, queries.get(resource))
+                for resource in resources
+            }
+
+        data = {}
+        executor = ThreadPoolExecutor(
+            max_workers=max_workers or len(resources),
+            thread_name_prefix="spacex-fetch",
+        )
+        try:
+            futures = {
+                executor.submit(
+                    self.fetch_resource, resource, queries.get(resource)
+                ): resource
+                for resource in resources
+            }
+            for future in as_completed(futures):
+                try:
+                    data[futures[future]] = future.result()
+                except Exception as exc:
+                    logger.error(
+                        "SpaceX resource fetch failed, cancelling remaining fetches",
+                        resource=futures[future],
+                        error=str(exc),
+                    )
+                    self.cancel_event.set()
+                    raise
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        return {resource: data[resource] for resource in resources}
@@ -1,10 +1,18 @@
 import decimal
-from dataclasses import dataclass
-from typing import Optional
+from datetime import date, datetime
+from typing import NamedTuple, Optional
 
+from ..enums import LaunchpadStatus, RocketType
 
-@dataclass
-class RocketDTO:
+# DTOs are decoded once from SpaceX API documents with `from_api`, converting
+# values to the types stored in the DB, so ingestion does no parsing of its own.
+# Field names match the API document keys, they make up the query projection.
+# NamedTuples are immutable and slotted like a frozen slots dataclass, but are
+# built by tuple.__new__ instead of one object.__setattr__ call per field;
+# `_make` takes the values positionally, in field order.
+
+
+class RocketDTO(NamedTuple):
     id: str
     name: str
     mass: int  # in kg
@@ -13,13 +21,30 @@ class RocketDTO:
     boosters: int
     success_rate_pct: int
     cost_per_launch: int
-    first_flight: str
-    type: str
+    first_flight: date
+    type: RocketType
     description: Optional[str]
 
+    @classmethod
+    def from_api(cls, item: dict) -> "RocketDTO":
+        return cls._make(
+            (
+                item["id"],
+                item.get("name"),
+                (item.get("mass") or {}).get("kg"),
+                item.get("active"),
+                item.get("stages"),
+                item.get("boosters"),
+                item.get("success_rate_pct"),
+                item.get("cost_per_launch"),
+                date.fromisoformat(item["first_flight"]),
+                RocketType(item["type"]),
+                item.get("description", ""),
+            )
+        )
+
 
-@dataclass
-class LaunchpadDTO:
+class LaunchpadDTO(NamedTuple):
     id: str
     name: str
     full_name: str
@@ -27,20 +52,52 @@ class LaunchpadDTO:
     region: str
     launch_attempts: int
     launch_successes: int
-    status: str
+    status: LaunchpadStatus
     latitude: decimal.Decimal
     longitude: decimal.Decimal
     details: Optional[str]
 
+    @classmethod
+    def from_api(cls, item: dict) -> "LaunchpadDTO":
+        return cls._make(
+            (
+                item["id"],
+                item.get("name"),
+                item.get("full_name"),
+                item.get("locality"),
+                item.get("region"),
+                item.get("launch_attempts"),
+                item.get("launch_successes"),
+                LaunchpadStatus(item["status"]),
+                # repr() keeps the shortest decimal form of the float sent by the API
+                decimal.Decimal(repr(item["latitude"])),
+                decimal.Decimal(repr(item["longitude"])),
+                item.get("details", ""),
+            )
+        )
 
-@dataclass
-class LaunchDTO:
+
+class LaunchDTO(NamedTuple):
     id: str
     name: str
-    date_utc: str
+    date_utc: datetime
     upcoming: bool
-    rocket: RocketDTO
     rocket: str
     launchpad: str
     details: Optional[str]
     success: bool | None = None
+
+    @classmethod
+    def from_api(cls, item: dict) -> "LaunchDTO":
+        return cls._make(
+            (
+                item["id"],
+                item.get("name"),
+                datetime.fromisoformat(item["date_utc"]),
+                item.get("upcoming"),
+                item.get("rocket"),
+                item.get("launchpad"),
+                item.get("details"),
+                item.get("success"),
+            )
+        )
@@ -0,0 +1,18 @@
+class ThirdPartyAPIError(Exception):
+    """Base class for errors raised by third party API clients."""
+
+
+class APICallCancelled(ThirdPartyAPIError):
+    """Raised when an in-flight call is abandoned because its batch was cancelled."""
+
+
+class DeadlineExceeded(ThirdPartyAPIError):
+    """Raised when the time left for a call can't cover another attempt."""
+
+
+class CircuitOpenError(ThirdPartyAPIError):
+    """Raised instead of calling a service whose circuit breaker is open."""
+
+    def __init__(self, url: str, breaker) -> None:
+        super().__init__(f"Not calling {url}: {breaker.describe()}")
+        self.breaker = breaker
@@ -0,0 +1,159 @@
+import math
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+
+class Deadline:
+    """Point in time by which a whole batch of calls must be finished."""
+
+    def __init__(self, seconds: float | None) -> None:
+        # None for no deadline; 0 is an already spent budget
+        self.expires_at = time.monotonic() + seconds if seconds is not None else None
+
+    def remaining(self) -> float:
+        if self.expires_at is None:
+            return math.inf
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+
+def backoff_with_jitter(attempt: int, base: float, cap: float) -> float:
+    """
+    Exponential backoff with "equal jitter": half of the delay is fixed and the
+    other half random, so concurrent clients don't retry in lockstep.
+    """
+    delay = min(cap, base**attempt)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Seconds to wait according to a `Retry-After` header, delay or HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket allowing `rate` acquisitions per second on average
+    and bursts of up to `capacity`.
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated_at) * self.rate
+        )
+        self.updated_at = now
+
+    def acquire(self, timeout: float = math.inf, sleep=time.sleep) -> bool:
+        """
+        Take a token, waiting for one with `sleep` for up to `timeout` seconds.
+        Returns False if no token could be had in time.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait_time = (1 - self.tokens) / self.rate
+
+            if time.monotonic() + wait_time > deadline:
+                return False
+            sleep(wait_time)
+
+
+class CircuitBreaker:
+    """
+    Stops calls to a failing service. After `failure_threshold` consecutive
+    failures the circuit opens and calls are refused for `reset_timeout`
+    seconds; then a single trial call is let through (half open), which closes
+    the circuit on success or opens it again on failure.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.last_error = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self.opened_at < self.reset_timeout:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    def retry_in(self) -> float:
+        """Seconds until the open circuit lets a trial call through."""
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def release(self) -> None:
+        """Forget an allowed call which ended neither in success nor failure."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self, error: Exception) -> None:
+        with self._lock:
+            self.failures += 1
+            self.last_error = error
+            if self._trial_in_flight or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+    def describe(self) -> str:
+        return (
+            f"circuit {self.state} after {self.failures} consecutive failures "
+            f"(last error: {self.last_error}), retry in {self.retry_in():.0f}s"
+        )
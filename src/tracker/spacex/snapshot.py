@@ -0,0 +1,100 @@
+import gzip
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from itertools import islice
+from pathlib import Path
+from typing import Iterator, List
+
+import structlog
+
+from .client import SpaceX
+from .exceptions import ThirdPartyAPIError
+
+logger = structlog.get_logger(__name__)
+
+SNAPSHOT_FORMAT = 1
+
+
+class SnapshotWriter:
+    """
+    Records raw SpaceX documents to a gzip compressed NDJSON file, one
+    `{"resource": ..., "doc": ...}` object per line after a header line.
+
+    Lines go to a temporary file which only replaces `path` on `commit()`, so a
+    failed fetch never leaves a partial snapshot behind.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+        self.count = 0
+        self._lock = threading.Lock()
+        self._file = gzip.open(self.tmp_path, "wt", encoding="utf-8")
+        self._write_line(
+            {
+                "snapshot": SNAPSHOT_FORMAT,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+            }
+        )
+
+    def _write_line(self, obj: dict) -> None:
+        self._file.write(json.dumps(obj, separators=(",", ":")))
+        self._file.write("\n")
+
+    def write(self, resource: str, doc: dict) -> None:
+        # Resources are fetched on several threads at once
+        with self._lock:
+            self._write_line({"resource": resource, "doc": doc})
+            self.count += 1
+
+    def commit(self) -> None:
+        self._file.close()
+        os.replace(self.tmp_path, self.path)
+        logger.info("Snapshot saved", path=str(self.path), documents=self.count)
+
+    def discard(self) -> None:
+        self._file.close()
+        self.tmp_path.unlink(missing_ok=True)
+
+
+def read_snapshot(path: str | Path, resource: str) -> Iterator[dict]:
+    """Yield the documents of `resource` recorded in a snapshot file."""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        header = json.loads(f.readline() or "{}")
+        if header.get("snapshot") != SNAPSHOT_FORMAT:
+            raise ValueError(f"{path} is not a SpaceX snapshot")
+
+        for line in f:
+            record = json.loads(line)
+            if record["resource"] == resource:
+                yield record["doc"]
+
+
+class SnapshotSpaceX(SpaceX):
+    """
+    SpaceX client replaying the documents of a snapshot file instead of calling
+    the API. Queries are ignored: every recorded document of a resource is
+    returned, in recorded order.
+    """
+
+    def __init__(self, path: str | Path, *args, **kwargs) -> None:
+        kwargs.setdefault("use_cache", False)
+        super().__init__(*args, **kwargs)
+        self.snapshot_path = Path(path)
+
+    def api_call(self, url: str, *args, **kwargs):
+        raise ThirdPartyAPIError(f"Refusing to call {url} while replaying a snapshot")
+
+    def query_pages(
+        self, resource: str, query: dict | None = None, page_size: int | None = None
+    ) -> Iterator[List[dict]]:
+        docs = read_snapshot(self.snapshot_path, resource)
+        while page := list(islice(docs, page_size or self.page_size)):
+            yield page
+
+    def stream_query_docs(
+        self, resource: str, query: dict | None = None, page_size: int | None = None
+    ) -> Iterator[dict]:
+        return read_snapshot(self.snapshot_path, resource)
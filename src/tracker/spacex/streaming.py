@@ -0,0 +1,117 @@
+import codecs
+import json
+from typing import Any, Iterable, Iterator
+
+_decoder = json.JSONDecoder()
+
+WHITESPACE = " \t\n\r"
+
+
+class _TextStream:
+    """Decoded text of a stream of byte chunks, consumed from left to right."""
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self.chunks = iter(chunks)
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Append the next chunk, dropping consumed text. False at end of stream."""
+        if self.eof:
+            return False
+        try:
+            chunk = next(self.chunks)
+        except StopIteration:
+            chunk = b""
+            self.eof = True
+        self.text = self.text[self.pos :] + self.decoder.decode(chunk, final=self.eof)
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character, or "" at end of stream."""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text) or not self.fill():
+                return self.text[self.pos : self.pos + 1]
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise json.JSONDecodeError(
+                f"Expecting {char!r}, found {found!r}", self.text, self.pos
+            )
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # A number or literal ending the buffer may continue in the next chunk
+            if end == len(self.text) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+
+def _iter_array(stream: _TextStream) -> Iterator[Any]:
+    stream.expect("[")
+    if stream.peek() == "]":
+        stream.pos += 1
+        return
+
+    while True:
+        yield stream.value()
+        if stream.peek() == ",":
+            stream.pos += 1
+            continue
+        stream.expect("]")
+        return
+
+
+def iter_json_array(
+    chunks: Iterable[bytes], key: str | None = None, meta: dict | None = None
+) -> Iterator[Any]:
+    """
+    Yield the elements of a JSON array as soon as their bytes have arrived,
+    without holding the whole document in memory.
+
+    The array is either the whole document or, with `key`, the value of that
+    key in a top-level object; the object's other members are decoded into
+    `meta`, which is complete once the generator is exhausted.
+    """
+    stream = _TextStream(chunks)
+
+    if key is None:
+        yield from _iter_array(stream)
+    else:
+        stream.expect("{")
+        if stream.peek() == "}":
+            stream.pos += 1
+        else:
+            while True:
+                name = stream.value()
+                stream.expect(":")
+                if name == key:
+                    yield from _iter_array(stream)
+                else:
+                    value = stream.value()
+                    if meta is not None:
+                        meta[name] = value
+                if stream.peek() == ",":
+                    stream.pos += 1
+                    continue
+                stream.expect("}")
+                break
+
+    if stream.peek():
+        raise json.JSONDecodeError("Extra data", stream.text, stream.pos)
@@ -0,0 +1,276 @@
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+
+import structlog
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from .aggregates import (
+    COUNTED_FIELDS,
+    LaunchCountDeltas,
+    launch_count_key,
+    store_launch_counts,
+    stored_launch_counts,
+)
+from .data_version import LAUNCHES, STATS, bump_data_version
+from .models import (
+    DataVersion,
+    Launch,
+    LaunchAggregate,
+    Launchpad,
+    Rocket,
+    StatsSnapshot,
+)
+
+logger = structlog.get_logger(__name__)
+
+# Name of the snapshot of the statistics served by /api/v1/stats/
+LAUNCH_STATS = "launches"
+
+# Launches read from the DB at a time while computing statistics
+STATS_CHUNK_SIZE = 5000
+
+
+def count_launches(launches: QuerySet) -> Counter:
+    """
+    Count `launches` by rocket, launchpad, month and outcome, in a single pass
+    streaming them from the DB. Keys are those of
+    `tracker.aggregates.launch_count_key`.
+    """
+    counts = Counter()
+    rows = (
+        launches.values_list(*COUNTED_FIELDS)
+        .order_by()
+        .iterator(chunk_size=STATS_CHUNK_SIZE)
+    )
+    for row in rows:
+        counts[launch_count_key(*row)] += 1
+    return counts
+
+
+def fold_launch_counts(counts: Counter) -> dict:
+    """
+    Per rocket, per site, yearly and monthly stats from `count_launches`
+    counts, which are a handful per month.
+    """
+    tz = timezone.get_current_timezone()
+    rocket_names = dict(Rocket.objects.values_list("id", "name"))
+    launchpad_names = dict(Launchpad.objects.values_list("id", "name"))
+    rockets = defaultdict(lambda: [0, 0])
+    sites = Counter()
+    years = Counter()
+    months = Counter()
+    for (rocket_id, launchpad_id, year, month, success), count in counts.items():
+        # Grouped by name, like the API always did
+        rocket = rockets[rocket_names[rocket_id]]
+        rocket[0] += count
+        if success:
+            rocket[1] += count
+        sites[launchpad_names[launchpad_id]] += count
+        years[year] += count
+        months[year, month] += count
+
+    # Most launches first, then by name
+    return {
+        "rocket_success_rates": [
+            {
+                "rocket__name": name,
+                "total": total,
+                "success_count": success_count,
+                "success_rate": success_count * 100.0 / total if total else 0.0,
+            }
+            for name, (total, success_count) in sorted(
+                rockets.items(), key=lambda item: (-item[1][0], item[0])
+            )
+        ],
+        "launches_per_site": [
+            {"launchpad__name": name, "total": total}
+            for name, total in sorted(
+                sites.items(), key=lambda item: (-item[1], item[0])
+            )
+        ],
+        "yearly_frequency": [
+            {"year": datetime(year, 1, 1, tzinfo=tz), "count": count}
+            for year, count in sorted(years.items())
+        ],
+        "monthly_frequency": [
+            {"month": datetime(year, month, 1, tzinfo=tz), "count": count}
+            for (year, month), count in sorted(months.items())
+        ],
+    }
+
+
+def compute_launch_stats() -> dict:
+    """Every launch statistic from a single pass over the launches."""
+    return fold_launch_counts(count_launches(Launch.objects.all()))
+
+
+def build_launch_stats_snapshot() -> StatsSnapshot:
+    """
+    Fold the LaunchAggregate counters into the launch statistics and store
+    them, along with the version of the stats data scope they were computed
+    from. Costs a read of the counters, whatever the number of launches.
+    Meant to run in the transaction which changed the data, after bumping
+    that version.
+    """
+    start = time.perf_counter()
+    counts = stored_launch_counts()
+    data = fold_launch_counts(counts)
+    version = (
+        DataVersion.objects.filter(scope=STATS)
+        .values_list("version", flat=True)
+        .first()
+    )
+    snapshot, _ = StatsSnapshot.objects.update_or_create(
+        name=LAUNCH_STATS,
+        defaults={
+            "data": data,
+            "data_version": version or 0,
+            "built_at": timezone.now(),
+            "build_duration": time.perf_counter() - start,
+        },
+    )
+    logger.info(
+        "Stats snapshot built",
+        name=LAUNCH_STATS,
+        data_version=snapshot.data_version,
+        counters=len(counts),
+        duration=round(snapshot.build_duration, 3),
+    )
+    return snapshot
+
+
+def rebuild_launch_stats() -> StatsSnapshot:
+    """
+    Recount every launch into the LaunchAggregate counters, then the stats, in
+    one transaction. Meant to run after bumping the stats version in the same
+    transaction, as syncs and commands do: the lock on its row serializes
+    concurrent rebuilds. Requests only read the counters and the stats.
+    """
+    with transaction.atomic():
+        store_launch_counts(count_launches(Launch.objects.all()), STATS_CHUNK_SIZE)
+        return build_launch_stats_snapshot()
+
+
+def launch_stats_built() -> bool:
+    # The counters are only kept up to date once the stats were built
+    return StatsSnapshot.objects.filter(name=LAUNCH_STATS).exists()
+
+
+def update_launch_stats(deltas: LaunchCountDeltas) -> StatsSnapshot:
+    """
+    Apply the counter changes of a sync and rebuild the stats from the
+    counters, or build both from scratch the first time.
+    """
+    if not launch_stats_built():
+        return rebuild_launch_stats()
+    deltas.apply()
+    return build_launch_stats_snapshot()
+
+
+def uncount_launches(counts: Counter) -> None:
+    """
+    Take deleted launches, counted by `count_launches`, out of the counters and
+    rebuild the stats, after bumping the versions of the launches and stats.
+    Meant to run in the transaction of the delete.
+    """
+    bump_data_version(LAUNCHES, STATS)
+    if launch_stats_built():
+        deltas = LaunchCountDeltas()
+        deltas.deleted(counts)
+        deltas.apply()
+        build_launch_stats_snapshot()
+
+
+def get_launch_stats() -> dict:
+    """
+    Launch statistics from their snapshot, or computed from the launches until
+    a sync or `rebuild_stats` builds it, e.g. on a database migrated since.
+    """
+    data = (
+        StatsSnapshot.objects.filter(name=LAUNCH_STATS)
+        .values_list("data", flat=True)
+        .first()
+    )
+    if data is None:
+        data = compute_launch_stats()
+    return data
+
+
+def month_start(moment: datetime) -> datetime:
+    local = moment.astimezone(timezone.get_current_timezone())
+    return local.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def next_month(month: datetime) -> datetime:
+    if month.month == 12:
+        return month.replace(year=month.year + 1, month=1)
+    return month.replace(month=month.month + 1)
+
+
+def count_filtered_launches(
+    launches: QuerySet,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    **filters,
+) -> Counter:
+    """
+    `count_launches` of `launches`, a queryset already filtered on the launch
+    time being in [start, end) and on `filters`, lookups of `rocket__name`,
+    `launchpad__name` or `success`.
+
+    Whole months of the range are counted from the `LaunchAggregate` buckets
+    matching `filters`; launches themselves are only read for the months in
+    which the range starts or ends, so a range costs the same however long.
+    """
+    first_whole = None
+    if start is not None:
+        first_whole = month_start(start)
+        if first_whole != start:
+            first_whole = next_month(first_whole)
+    # Months before the one `end` falls in are whole
+    last_whole_end = None if end is None else month_start(end)
+    if (
+        first_whole is not None
+        and last_whole_end is not None
+        and first_whole >= last_whole_end
+    ):
+        # No whole month in the range
+        return count_launches(launches)
+
+    if not launch_stats_built():
+        # No counters to read yet, see `get_launch_stats`
+        return count_launches(launches)
+    buckets = LaunchAggregate.objects.filter(**filters)
+    if first_whole is not None:
+        buckets = buckets.filter(month__gte=first_whole.date())
+    if last_whole_end is not None:
+        buckets = buckets.filter(month__lt=last_whole_end.date())
+
+    counts = Counter()
+    for rocket_id, launchpad_id, month, success, count in buckets.values_list(
+        "rocket_id", "launchpad_id", "month", "success", "count"
+    ).iterator():
+        counts[rocket_id, launchpad_id, month.year, month.month, success] += count
+    # Partial months at either end of the range
+    if first_whole is not None and first_whole != start:
+        counts.update(count_launches(launches.filter(launch_datetime__lt=first_whole)))
+    if last_whole_end is not None and last_whole_end != end:
+        counts.update(
+            count_launches(launches.filter(launch_datetime__gte=last_whole_end))
+        )
+    return counts
+
+
+def get_filtered_launch_stats(
+    launches: QuerySet,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    **filters,
+) -> dict:
+    """Launch statistics of `launches`, see `count_filtered_launches`."""
+    return fold_launch_counts(
+        count_filtered_launches(launches, start=start, end=end, **filters)
+    )
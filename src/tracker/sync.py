@@ -0,0 +1,214 @@
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from enum import Enum
+from itertools import islice
+from typing import Iterable, Iterator, Sequence, TypeVar
+
+from django.db import models
+
+from .models import Launch, Launchpad, Rocket
+from .spacex.dataclasses import LaunchDTO, LaunchpadDTO, RocketDTO
+
+SYNC_BATCH_SIZE = 500
+
+# Columns refreshed from SpaceX on every sync, i.e. all but the key and created_at
+ROCKET_FIELDS = (
+    "name",
+    "mass",
+    "type",
+    "active",
+    "stages",
+    "boosters",
+    "cost_per_launch",
+    "success_rate_pct",
+    "first_flight",
+    "description",
+)
+LAUNCHPAD_FIELDS = (
+    "name",
+    "full_name",
+    "locality",
+    "region",
+    "launch_attempts",
+    "launch_successes",
+    "status",
+    "latitude",
+    "longitude",
+    "details",
+)
+LAUNCH_FIELDS = (
+    "name",
+    "launch_datetime",
+    "upcoming",
+    "success",
+    "rocket",
+    "launchpad",
+    "details",
+)
+
+T = TypeVar("T")
+
+
+@dataclass
+class SyncResult:
+    inserted: int = 0
+    updated: int = 0
+    # rows whose fingerprint matched the stored one, so were not written
+    skipped: int = 0
+
+    def __iadd__(self, other: "SyncResult") -> "SyncResult":
+        self.inserted += other.inserted
+        self.updated += other.updated
+        self.skipped += other.skipped
+        return self
+
+    @property
+    def changed(self) -> int:
+        return self.inserted + self.updated
+
+
+def batched(iterable: Iterable[T], size: int) -> Iterator[list[T]]:
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def rocket_from_dto(r: RocketDTO) -> Rocket:
+    return Rocket(
+        id=r.id,
+        name=r.name,
+        mass=r.mass,
+        type=r.type,
+        active=r.active,
+        stages=r.stages,
+        boosters=r.boosters,
+        cost_per_launch=r.cost_per_launch,
+        success_rate_pct=r.success_rate_pct,
+        first_flight=r.first_flight,
+        description=r.description,
+    )
+
+
+def launchpad_from_dto(lp: LaunchpadDTO) -> Launchpad:
+    return Launchpad(
+        id=lp.id,
+        name=lp.name,
+        full_name=lp.full_name,
+        locality=lp.locality,
+        region=lp.region,
+        launch_attempts=lp.launch_attempts,
+        launch_successes=lp.launch_successes,
+        status=lp.status,
+        latitude=lp.latitude,
+        longitude=lp.longitude,
+        details=lp.details,
+    )
+
+
+def launch_from_dto(l: LaunchDTO) -> Launch:
+    return Launch(
+        id=l.id,
+        name=l.name,
+        launch_datetime=l.date_utc,
+        upcoming=l.upcoming,
+        success=l.success,
+        rocket_id=l.rocket,
+        launchpad_id=l.launchpad,
+        details=l.details,
+    )
+
+
+def _canonical(field: models.Field, value):
+    if isinstance(value, Enum):
+        return value.value
+    # Decimals are stored rounded to the column's decimal places
+    if isinstance(field, models.DecimalField) and isinstance(value, Decimal):
+        return str(value.quantize(Decimal(1).scaleb(-field.decimal_places)))
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def fingerprint(obj: models.Model, fields: Sequence[models.Field]) -> str:
+    """Stable hash of the values of `fields` on `obj`."""
+    values = [_canonical(field, getattr(obj, field.attname)) for field in fields]
+    payload = json.dumps(values, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def upsert_batch(
+    model: type[models.Model],
+    objects: Sequence[models.Model],
+    fields: Sequence[str],
+    observer=None,
+) -> SyncResult:
+    """
+    Insert new rows and update changed ones of a batch with one SELECT of the
+    stored fingerprints and one INSERT .. ON CONFLICT DO UPDATE of the rows
+    which are new or whose fingerprint differs (split further only if the DB
+    limits query parameters). Rows with a matching fingerprint are not written.
+
+    An `observer`, e.g. `tracker.aggregates.LaunchCountDeltas`, has its
+    `written(previous, obj)` called for every row written, `previous` being the
+    stored values of its `fields`, or None for new rows. They are read by the
+    same SELECT.
+
+    Objects repeated in the batch, e.g. a document returned on two pages of a
+    collection which changed while being paged, are written once, from the
+    last copy.
+    """
+    objects = list({obj.pk: obj for obj in objects}.values())
+    model_fields = [model._meta.get_field(name) for name in fields]
+    observed = tuple(observer.fields) if observer is not None else ()
+
+    stored = {
+        pk: (stored_fingerprint, values)
+        for pk, stored_fingerprint, *values in model.objects.filter(
+            pk__in=[obj.pk for obj in objects]
+        )
+        .values_list("pk", "fingerprint", *observed)
+        .iterator()
+    }
+
+    result = SyncResult()
+    to_write = []
+    for obj in objects:
+        obj.fingerprint = fingerprint(obj, model_fields)
+        previous, values = stored.get(obj.pk, (None, None))
+        if previous is None:
+            result.inserted += 1
+        elif previous != obj.fingerprint:
+            result.updated += 1
+        else:
+            result.skipped += 1
+            continue
+        to_write.append(obj)
+        if observer is not None:
+            observer.written(
+                None if values is None else dict(zip(observed, values)), obj
+            )
+
+    if to_write:
+        model.objects.bulk_create(
+            to_write,
+            update_conflicts=True,
+            update_fields=[*fields, "fingerprint"],
+            unique_fields=[model._meta.pk.name],
+        )
+    return result
+
+
+def upsert(
+    model: type[models.Model],
+    objects: Iterable[models.Model],
+    fields: Sequence[str],
+    batch_size: int = SYNC_BATCH_SIZE,
+    observer=None,
+) -> SyncResult:
+    result = SyncResult()
+    for batch in batched(objects, batch_size):
+        result += upsert_batch(model, batch, fields, observer)
+    return result
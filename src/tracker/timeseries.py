@@ -0,0 +1,161 @@
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+from itertools import accumulate
+from operator import sub
+
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from .models import Launchpad, Rocket
+from .stats import STATS_CHUNK_SIZE
+
+DAY = "day"
+WEEK = "week"
+MONTH = "month"
+QUARTER = "quarter"
+YEAR = "year"
+BUCKETS = (DAY, WEEK, MONTH, QUARTER, YEAR)
+# Buckets which whole months fall in, so can be counted from monthly counts
+MONTHLY_BUCKETS = (MONTH, QUARTER, YEAR)
+
+ROCKET = "rocket"
+LAUNCHPAD = "launchpad"
+GROUPS = (ROCKET, LAUNCHPAD)
+
+
+def count_launches_by_day(launches: QuerySet) -> Counter:
+    """
+    Like `tracker.stats.count_launches`, by day instead of month: keys are
+    (rocket_id, launchpad_id, day, success), days of the current time zone.
+    """
+    tz = timezone.get_current_timezone()
+    counts = Counter()
+    rows = (
+        launches.values_list("rocket_id", "launchpad_id", "launch_datetime", "success")
+        .order_by()
+        .iterator(chunk_size=STATS_CHUNK_SIZE)
+    )
+    for rocket_id, launchpad_id, launch_datetime, success in rows:
+        day = launch_datetime.astimezone(tz).date()
+        counts[rocket_id, launchpad_id, day, success] += 1
+    return counts
+
+
+def monthly_to_daily(counts: Counter) -> Counter:
+    """`tracker.stats.count_launches` counts keyed by the first day of months."""
+    return Counter(
+        {
+            (rocket_id, launchpad_id, date(year, month, 1), success): count
+            for (rocket_id, launchpad_id, year, month, success), count in counts.items()
+        }
+    )
+
+
+def bucket_start(day: date, bucket: str) -> date:
+    if bucket == DAY:
+        return day
+    if bucket == WEEK:
+        # Weeks start on Monday, like TruncWeek
+        return day - timedelta(days=day.weekday())
+    if bucket == MONTH:
+        return day.replace(day=1)
+    if bucket == QUARTER:
+        return date(day.year, (day.month - 1) // 3 * 3 + 1, 1)
+    return date(day.year, 1, 1)
+
+
+def next_bucket(start: date, bucket: str) -> date:
+    if bucket == DAY:
+        return start + timedelta(days=1)
+    if bucket == WEEK:
+        return start + timedelta(weeks=1)
+    months = {MONTH: 1, QUARTER: 3, YEAR: 12}[bucket]
+    year, month = divmod(start.month - 1 + months, 12)
+    return date(start.year + year, month + 1, 1)
+
+
+def rolling_sums(values: list[int], window: int) -> list[int]:
+    """Sums of the last `window` values at each position, from prefix sums."""
+    prefix = list(accumulate(values, initial=0))
+    # prefix[i + 1] - prefix[i + 1 - window], clamped at the start
+    lagged = [0] * min(window - 1, len(values)) + prefix[: max(len(prefix) - window, 0)]
+    return list(map(sub, prefix[1:], lagged))
+
+
+def rates(numerators: list[int], denominators: list[int]) -> list[float | None]:
+    return [
+        round(numerator * 100 / denominator, 2) if denominator else None
+        for numerator, denominator in zip(numerators, denominators)
+    ]
+
+
+def launch_time_series(
+    counts: Counter, bucket: str, window: int, group_by: str | None = None
+) -> dict:
+    """
+    Columnar time series of `count_launches_by_day` counts: the start of every
+    `bucket` from the first to the last one with launches, and for each series,
+    i.e. all launches or those of each rocket or launchpad as per `group_by`,
+    columns aligned with these buckets:
+
+    - launches and successes in the bucket
+    - rolling_success_rate: success rate over the last `window` buckets
+    - cadence: launches per bucket over the last `window` buckets
+
+    Rolling figures are computed on whole columns from prefix sums. The first
+    `window - 1` buckets have fewer buckets before them, so their figures are
+    over the buckets so far.
+    """
+    names = {}
+    if group_by == ROCKET:
+        names = dict(Rocket.objects.values_list("id", "name"))
+    elif group_by == LAUNCHPAD:
+        names = dict(Launchpad.objects.values_list("id", "name"))
+
+    launches = defaultdict(Counter)
+    successes = defaultdict(Counter)
+    for (rocket_id, launchpad_id, day, success), count in counts.items():
+        name = None
+        if group_by is not None:
+            name = names[rocket_id if group_by == ROCKET else launchpad_id]
+        start = bucket_start(day, bucket)
+        launches[name][start] += count
+        if success:
+            successes[name][start] += count
+
+    buckets = []
+    if launches:
+        start = min(min(series) for series in launches.values())
+        last = max(max(series) for series in launches.values())
+        while start <= last:
+            buckets.append(start)
+            start = next_bucket(start, bucket)
+
+    series = []
+    # Most launches first, then by name
+    for name in sorted(launches, key=lambda name: (-launches[name].total(), name)):
+        launch_counts = list(map(launches[name].__getitem__, buckets))
+        success_counts = list(map(successes[name].__getitem__, buckets))
+        rolling_launches = rolling_sums(launch_counts, window)
+        series.append(
+            {
+                "name": name,
+                "launches": launch_counts,
+                "successes": success_counts,
+                "rolling_success_rate": rates(
+                    rolling_sums(success_counts, window), rolling_launches
+                ),
+                "cadence": [
+                    round(total / min(window, i + 1), 2)
+                    for i, total in enumerate(rolling_launches)
+                ],
+            }
+        )
+
+    return {
+        "bucket": bucket,
+        "window": window,
+        "group_by": group_by,
+        "buckets": buckets,
+        "series": series,
+    }
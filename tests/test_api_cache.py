@@ -0,0 +1,234 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from api.cache import warm_up_api_cache, warm_up_host
+from tracker.data_version import (
+    LAUNCHES,
+    ROCKETS,
+    SCOPES,
+    STATS,
+    bump_data_version,
+    get_data_versions,
+)
+from tracker.models import Launch, Rocket
+
+from .conftest import ROCKETS as ROCKET_DOCS
+from .conftest import mock_query_endpoint
+
+
+@pytest.mark.django_db
+def test_cached_launches_invalidated_by_data_version_bump(
+    api_client: APIClient,
+    launch1: Launch,
+    launch2: Launch,
+    django_capture_on_commit_callbacks,
+):
+    url = reverse("v1:launch-detail", args=[launch1.id])
+    assert api_client.get(url).json()["name"] == launch1.name
+
+    Launch.objects.filter(id=launch1.id).update(name="Renamed")
+    # Still served from the cache
+    assert api_client.get(url).json()["name"] == launch1.name
+
+    with django_capture_on_commit_callbacks(execute=True):
+        bump_data_version(LAUNCHES)
+
+    assert get_data_versions([LAUNCHES]) == {LAUNCHES: 1}
+    assert api_client.get(url).json()["name"] == "Renamed"
+
+
+@pytest.mark.django_db
+def test_stats_cache_survives_unrelated_data_version_bump(
+    api_client: APIClient,
+    launch1: Launch,
+    django_capture_on_commit_callbacks,
+):
+    url = reverse("v1:launch-stats-list")
+    assert api_client.get(url).headers["X-Cache"] == "MISS"
+
+    with django_capture_on_commit_callbacks(execute=True):
+        bump_data_version(ROCKETS)
+    assert api_client.get(url).headers["X-Cache"] == "HIT"
+
+    with django_capture_on_commit_callbacks(execute=True):
+        bump_data_version(STATS)
+    assert api_client.get(url).headers["X-Cache"] == "MISS"
+
+
+@pytest.mark.django_db
+def test_response_cache_stats_counts_hits_misses_and_invalidations(
+    api_client: APIClient, launch1: Launch
+):
+    for _ in range(3):
+        api_client.get(reverse("v1:launch-list"))
+    bump_data_version(LAUNCHES, STATS)
+
+    response = api_client.get(reverse("v1:cache-stats-list"))
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["views"]["LaunchViewSet"] == {
+        "hits": 2,
+        "misses": 1,
+        "hit_rate": 0.6667,
+    }
+    assert data["views"]["LaunchStatsViewSet"]["hit_rate"] is None
+    assert data["invalidations"] == {LAUNCHES: 1, STATS: 1}
+
+
+@pytest.mark.django_db
+def test_fetch_spacex_data_warms_up_api_cache(
+    api_client: APIClient,
+    django_assert_num_queries,
+    mock_spacex_api_endpoint_launches: None,
+    mock_spacex_api_endpoint_launchpads: None,
+    mock_spacex_api_endpoint_rockets: None,
+):
+    call_command("fetch_spacex_data")
+
+    assert get_data_versions(SCOPES) == dict.fromkeys(SCOPES, 1)
+    with django_assert_num_queries(0):
+        stats = api_client.get(reverse("v1:launch-stats-list"))
+        launches = api_client.get(reverse("v1:launch-list"), {"success": "true"})
+
+    assert stats.headers["X-Cache"] == "HIT"
+    assert launches.headers["X-Cache"] == "HIT"
+
+
+@pytest.mark.parametrize("host", [None, "*", ".example.com", "example.com"])
+def test_api_cache_warm_up_skipped_without_allowed_host(settings, host):
+    settings.API_CACHE_WARMUP_HOST = host
+
+    assert warm_up_host() is None
+    assert warm_up_api_cache() == 0
+
+
+@pytest.mark.django_db
+def test_fetch_spacex_data_bumps_only_changed_scopes(
+    requests_mock,
+    mock_spacex_api_endpoint_launches: None,
+    mock_spacex_api_endpoint_launchpads: None,
+):
+    mock_query_endpoint(requests_mock, "rockets", ROCKET_DOCS)
+    call_command("fetch_spacex_data", no_warm_up=True)
+    # Nothing changed
+    call_command("fetch_spacex_data", full=True, no_warm_up=True)
+
+    described = [{**ROCKET_DOCS[0], "description": "Rewritten"}, *ROCKET_DOCS[1:]]
+    mock_query_endpoint(requests_mock, "rockets", described)
+    call_command("fetch_spacex_data", full=True, no_warm_up=True)
+
+    assert Rocket.objects.get(id=described[0]["id"]).description == "Rewritten"
+    assert get_data_versions(SCOPES) == {
+        "launches": 1,
+        "rockets": 2,
+        "launchpads": 1,
+        "stats": 1,
+    }
+
+
+@pytest.mark.django_db
+def test_equivalent_launch_queries_share_cache_entry(
+    api_client: APIClient, launch1: Launch, launch2: Launch
+):
+    date = (launch1.launch_datetime - timedelta(days=1)).date()
+    equivalent = [
+        {"success": "true", "rocket__name": "Falcon 1"},
+        {"rocket__name": "Falcon 1", "success": "true"},
+        {"success": "True", "rocket__name": "Falcon 1", "limit": 100},
+        {"success": "1", "rocket__name": "Falcon 1", "launchpad__name": ""},
+        {
+            "success": "true",
+            "rocket__name": "Falcon 1",
+            "launch_date__gte": date.isoformat(),
+        },
+        {
+            "launch_date__gte": date.strftime("%d-%m-%Y"),
+            "success": "true",
+            "rocket__name": "Falcon 1",
+        },
+    ]
+
+    responses = [api_client.get(reverse("v1:launch-list"), q) for q in equivalent]
+
+    # The date filter narrows nothing down here, yet is a different query
+    assert [r.headers["X-Cache"] for r in responses] == [
+        "MISS",
+        "HIT",
+        "HIT",
+        "HIT",
+        "MISS",
+        "HIT",
+    ]
+    assert all(r.json()["results"] == responses[0].json()["results"] for r in responses)
+    assert [item["id"] for item in responses[0].json()["results"]] == [launch2.id]
+
+    stats = api_client.get(reverse("v1:cache-stats-list")).json()
+    assert stats["views"]["LaunchViewSet"]["hit_rate"] == round(4 / 6, 4)
+
+
+@pytest.mark.django_db
+def test_different_launch_queries_dont_share_cache_entry(
+    api_client: APIClient, launch1: Launch, launch2: Launch
+):
+    url = reverse("v1:launch-list")
+    queries = [{"success": "true"}, {"success": "false"}, {"limit": 1}, {"offset": 1}]
+
+    assert [api_client.get(url, q).headers["X-Cache"] for q in queries] == [
+        "MISS"
+    ] * len(queries)
+
+
+@pytest.mark.django_db
+def test_launches_if_none_match_not_modified_without_queries(
+    api_client: APIClient,
+    launch1: Launch,
+    django_assert_num_queries,
+    django_capture_on_commit_callbacks,
+):
+    url = reverse("v1:launch-list")
+    etag = api_client.get(url, {"success": "false"}).headers["ETag"]
+    assert etag.startswith('"')
+
+    with django_assert_num_queries(0):
+        response = api_client.get(url, {"success": "False"}, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+    assert response.headers["Cache-Control"] == "max-age=60"
+    # Another query
+    assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    with django_capture_on_commit_callbacks(execute=True):
+        bump_data_version(LAUNCHES)
+    response = api_client.get(url, {"success": "false"}, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_stats_if_modified_since_last_bump(
+    api_client: APIClient, launch1: Launch, django_capture_on_commit_callbacks
+):
+    url = reverse("v1:launch-stats-list")
+    assert "Last-Modified" not in api_client.get(url).headers
+
+    with django_capture_on_commit_callbacks(execute=True):
+        bump_data_version(STATS)
+    last_modified = api_client.get(url).headers["Last-Modified"]
+    response = api_client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+    assert response.status_code == 304
+    assert response.headers["Last-Modified"] == last_modified
+    assert (
+        api_client.get(
+            url, HTTP_IF_MODIFIED_SINCE="Sat, 01 Jan 2000 00:00:00 GMT"
+        ).status_code
+        == 200
+    )
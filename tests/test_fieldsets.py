@@ -0,0 +1,129 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from tracker.models import Launch
+
+
+@pytest.mark.django_db
+def test_launch_relations_rendered_as_ids_by_default(
+    api_client: APIClient, launch1: Launch
+):
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get(reverse("v1:launch-detail", args=[launch1.id]))
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["rocket"] == launch1.rocket_id
+    assert data["launchpad"] == launch1.launchpad_id
+    assert all("JOIN" not in query["sql"] for query in queries.captured_queries)
+
+
+@pytest.mark.django_db
+def test_launch_expand_nests_related_objects(
+    api_client: APIClient, launch1: Launch, launch2: Launch
+):
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get(reverse("v1:launch-list"), {"expand": "rocket"})
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [item["rocket"]["name"] for item in results] == ["Falcon 1"] * 2
+    assert [item["launchpad"] for item in results] == [
+        launch1.launchpad_id,
+        launch2.launchpad_id,
+    ]
+    # Rockets are serialized once, not fetched per launch
+    sql = [q["sql"] for q in queries.captured_queries if "tracker_" in q["sql"]]
+    assert len([query for query in sql if "tracker_rocket" in query]) == 1
+    assert len([query for query in sql if "tracker_launch" in query]) == 1
+
+
+@pytest.mark.django_db
+def test_launch_fields_selects_rendered_fields_and_columns(
+    api_client: APIClient, launch1: Launch, launch2: Launch
+):
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get(
+            reverse("v1:launch-list"), {"fields": "name,id", "expand": "launchpad"}
+        )
+
+    assert response.status_code == 200
+    assert response.json()["results"] == [
+        {"id": launch1.id, "name": launch1.name},
+        {"id": launch2.id, "name": launch2.name},
+    ]
+    # launchpad isn't rendered, so isn't expanded either
+    (sql,) = [
+        q["sql"] for q in queries.captured_queries if "tracker_launch" in q["sql"]
+    ]
+    assert "JOIN" not in sql
+    assert '"details"' not in sql
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "params", [{"fields": "id,nope"}, {"expand": "details"}, {"expand": "nope"}]
+)
+def test_launch_unknown_fields_rejected(
+    api_client: APIClient, launch1: Launch, params: dict
+):
+    response = api_client.get(reverse("v1:launch-list"), params)
+
+    assert response.status_code == 400
+    assert set(response.json()) == set(params)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("fields", ["", ",", " "])
+def test_launch_empty_fields_renders_every_field(
+    api_client: APIClient, launch1: Launch, fields: str
+):
+    url = reverse("v1:launch-list")
+    expected = api_client.get(url).json()
+
+    response = api_client.get(url, {"fields": fields})
+
+    assert response.status_code == 200
+    assert response.headers["X-Cache"] == "HIT"
+    assert response.json() == expected
+    assert response.json()["results"][0]["id"] == launch1.id
+
+
+@pytest.mark.django_db
+def test_equivalent_fieldsets_share_cache_entry(api_client: APIClient, launch1: Launch):
+    url = reverse("v1:launch-list")
+    queries = [
+        {"fields": "id,rocket", "expand": "rocket"},
+        {"fields": "rocket, id", "expand": "rocket,rocket"},
+        {"fields": "id,rocket"},
+        {"fields": "id,name", "expand": "rocket"},
+        {"fields": "id,name"},
+    ]
+
+    assert [api_client.get(url, q).headers["X-Cache"] for q in queries] == [
+        "MISS",
+        "HIT",
+        "MISS",
+        "MISS",
+        "HIT",
+    ]
+
+
+@pytest.mark.django_db
+def test_launch_expand_joins_related_objects_of_launch(
+    api_client: APIClient, launch1: Launch
+):
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get(
+            reverse("v1:launch-detail", args=[launch1.id]), {"expand": "launchpad"}
+        )
+
+    assert response.json()["launchpad"]["name"] == launch1.launchpad.name
+    (sql,) = [
+        q["sql"] for q in queries.captured_queries if "tracker_launch" in q["sql"]
+    ]
+    assert "JOIN" in sql
+    assert "tracker_rocket" not in sql
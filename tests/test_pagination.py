@@ -0,0 +1,103 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from tracker.models import Launch
+
+
+def walk(api_client: APIClient, url: str, params: dict, link: str) -> list[str]:
+    ids = []
+    response = api_client.get(url, params)
+    while True:
+        data = response.json()
+        ids.extend(item["id"] for item in data["results"])
+        if not data[link]:
+            return ids
+        response = api_client.get(data[link])
+
+
+@pytest.fixture
+def launch3(launch1: Launch) -> Launch:
+    # Same launch time as launch1, ordered after it by id
+    return Launch.objects.create(
+        id="l3",
+        name="DemoSat",
+        launch_datetime=launch1.launch_datetime,
+        success=True,
+        rocket=launch1.rocket,
+        launchpad=launch1.launchpad,
+        upcoming=False,
+    )
+
+
+@pytest.mark.django_db
+def test_launches_keyset_pages_forward_and_back(
+    api_client: APIClient, launch1: Launch, launch2: Launch, launch3: Launch
+):
+    url = reverse("v1:launch-list")
+    first = api_client.get(url, {"limit": 1}).json()
+
+    assert "count" not in first
+    assert first["previous"] is None
+    assert walk(api_client, url, {"limit": 1}, "next") == ["l1", "l3", "l2"]
+
+    last = api_client.get(url, {"limit": 1})
+    while last.json()["next"]:
+        last = api_client.get(last.json()["next"])
+    assert walk(api_client, last.json()["previous"], {}, "previous") == ["l3", "l1"]
+
+
+@pytest.mark.django_db
+def test_launches_keyset_pages_stable_while_rows_are_inserted(
+    api_client: APIClient, launch1: Launch, launch2: Launch
+):
+    url = reverse("v1:launch-list")
+    first = api_client.get(url, {"limit": 1}).json()
+    assert [item["id"] for item in first["results"]] == [launch1.id]
+
+    Launch.objects.create(
+        id="l0",
+        name="Trailblazer",
+        launch_datetime=launch1.launch_datetime - timedelta(days=1),
+        rocket=launch1.rocket,
+        launchpad=launch1.launchpad,
+        upcoming=False,
+    )
+
+    second = api_client.get(first["next"]).json()
+    assert [item["id"] for item in second["results"]] == [launch2.id]
+
+
+@pytest.mark.django_db
+def test_launches_keyset_pages_run_no_count_query(
+    api_client: APIClient, launch1: Launch, launch2: Launch
+):
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get(reverse("v1:launch-list"), {"limit": 1})
+
+    assert response.status_code == 200
+    assert not any("COUNT(" in query["sql"] for query in queries)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("params", [{"pagination": "offset"}, {"offset": 0}])
+def test_launches_limit_offset_pagination_kept_for_old_clients(
+    api_client: APIClient, launch1: Launch, launch2: Launch, params: dict
+):
+    response = api_client.get(reverse("v1:launch-list"), {**params, "limit": 1})
+
+    data = response.json()
+    assert data["count"] == 2
+    assert [item["id"] for item in data["results"]] == [launch1.id]
+    assert "offset=1" in data["next"]
+
+
+@pytest.mark.django_db
+def test_launches_invalid_cursor(api_client: APIClient, launch1: Launch):
+    response = api_client.get(reverse("v1:launch-list"), {"cursor": "bm90IGpzb24"})
+
+    assert response.status_code == 404
@@ -0,0 +1,269 @@
+import time
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+from tracker.enums import LaunchpadStatus, RocketType
+from tracker.spacex.cache import CachedResponse, ResponseCache
+from tracker.spacex.client import SpaceX, ThirdPartyAPI
+from tracker.spacex.exceptions import APICallCancelled, DeadlineExceeded
+from tracker.spacex.resilience import parse_retry_after
+
+from .conftest import LAUNCHES, mock_query_endpoint
+
+
+@pytest.fixture(autouse=True)
+def fresh_sessions():
+    ThirdPartyAPI.close_sessions()
+    yield
+    ThirdPartyAPI.close_sessions()
+
+
+def test_clients_share_pooled_session():
+    assert SpaceX().session is SpaceX().session
+    assert SpaceX().session is ThirdPartyAPI().session
+
+
+def test_session_uses_configured_pool():
+    client = ThirdPartyAPI(pool_connections=3, pool_maxsize=7, keep_alive=False)
+    adapter = client.session.get_adapter("https://api.spacexdata.com/v4/")
+
+    assert isinstance(adapter, HTTPAdapter)
+    assert adapter._pool_connections == 3
+    assert adapter._pool_maxsize == 7
+    assert client.session.headers["Connection"] == "close"
+    assert client.session is not ThirdPartyAPI().session
+
+
+def test_api_call_goes_through_session(requests_mock):
+    mock_query_endpoint(requests_mock, "rockets", [])
+
+    client = SpaceX()
+    assert client.fetch_rockets() == []
+    assert requests_mock.last_request.headers["Connection"] == "keep-alive"
+
+
+@pytest.mark.parametrize("concurrent", [False, True])
+def test_fetch_data_returns_all_resources(
+    mock_spacex_api_endpoint_launches: None,
+    mock_spacex_api_endpoint_launchpads: None,
+    mock_spacex_api_endpoint_rockets: None,
+    concurrent: bool,
+):
+    data = SpaceX().fetch_data(concurrent=concurrent, max_workers=2)
+
+    assert list(data) == ["launches", "rockets", "launchpads"]
+    assert [len(items) for items in data.values()] == [2, 2, 2]
+
+
+def test_concurrent_fetch_data_raises_first_failure(
+    requests_mock,
+    mock_spacex_api_endpoint_launches: None,
+    mock_spacex_api_endpoint_launchpads: None,
+):
+    requests_mock.post(
+        "https://api.spacexdata.com/v4/rockets/query", exc=ValueError("bad payload")
+    )
+    client = SpaceX()
+
+    with pytest.raises(ValueError, match="bad payload"):
+        client.fetch_data(concurrent=True)
+
+    assert client.cancel_event.is_set()
+
+
+def test_cancelled_client_stops_before_calling(requests_mock):
+    mock_query_endpoint(requests_mock, "rockets", [])
+    client = SpaceX()
+    client.cancel_event.set()
+
+    with pytest.raises(APICallCancelled):
+        client.fetch_rockets()
+
+    assert not requests_mock.called
+
+
+def test_query_pages_paginates_and_projects_dto_fields(requests_mock):
+    mock_query_endpoint(requests_mock, "launches", LAUNCHES)
+
+    pages = list(SpaceX(page_size=1).query_pages("launches"))
+
+    assert [[doc["id"] for doc in page] for page in pages] == [
+        ["5eb87cd9ffd86e000604b32a"],
+        ["5eb87cdaffd86e000604b32b"],
+    ]
+    assert set(pages[0][0]) == {
+        "id",
+        "name",
+        "date_utc",
+        "upcoming",
+        "success",
+        "rocket",
+        "launchpad",
+        "details",
+    }
+
+    options = [request.json()["options"] for request in requests_mock.request_history]
+    assert [option["page"] for option in options] == [1, 2]
+    assert all(option["limit"] == 1 for option in options)
+
+
+def test_iter_pages_yields_dtos_per_page(mock_spacex_api_endpoint_launches: None):
+    pages = SpaceX(page_size=1).iter_pages("launches")
+
+    first_page = next(pages)
+    assert [launch.name for launch in first_page] == ["FalconSat"]
+    assert [launch.name for launch in next(pages)] == ["DemoSat"]
+
+
+ROCKETS_QUERY_URL = "https://api.spacexdata.com/v4/rockets/query"
+
+
+def test_get_json_data_reuses_cached_payload_on_304(requests_mock):
+    requests_mock.post(
+        ROCKETS_QUERY_URL,
+        [
+            {"json": [{"id": "r1"}], "headers": {"ETag": '"v1"'}},
+            {"status_code": 304, "headers": {"ETag": '"v1"'}},
+        ],
+    )
+    client = ThirdPartyAPI()
+
+    assert client.get_json_data(ROCKETS_QUERY_URL, data={"query": {}}) == [{"id": "r1"}]
+    assert client.get_json_data(ROCKETS_QUERY_URL, data={"query": {}}) == [{"id": "r1"}]
+
+    first, second = requests_mock.request_history
+    assert "If-None-Match" not in first.headers
+    assert second.headers["If-None-Match"] == '"v1"'
+
+
+def test_get_json_data_cache_is_keyed_by_body(requests_mock):
+    requests_mock.post(
+        ROCKETS_QUERY_URL,
+        [
+            {"json": [{"id": "r1"}], "headers": {"ETag": '"v1"'}},
+            {"json": [{"id": "r2"}], "headers": {"ETag": '"v2"'}},
+        ],
+    )
+    client = ThirdPartyAPI()
+
+    client.get_json_data(ROCKETS_QUERY_URL, data={"options": {"page": 1}})
+    client.get_json_data(ROCKETS_QUERY_URL, data={"options": {"page": 2}})
+
+    assert all(
+        "If-None-Match" not in request.headers
+        for request in requests_mock.request_history
+    )
+
+
+def test_get_json_data_without_cache(requests_mock, spacex_cache_dir):
+    requests_mock.post(ROCKETS_QUERY_URL, json=[{"id": "r1"}], headers={"ETag": '"v1"'})
+    client = ThirdPartyAPI(use_cache=False)
+
+    client.get_json_data(ROCKETS_QUERY_URL)
+    client.get_json_data(ROCKETS_QUERY_URL)
+
+    assert client.response_cache is None
+    assert "If-None-Match" not in requests_mock.last_request.headers
+    assert not spacex_cache_dir.exists()
+
+
+def test_response_cache_evicts_least_recently_used(tmp_path):
+    cache = ResponseCache(tmp_path, max_bytes=250)
+    payload = ["x" * 50]
+
+    for key in ("a", "b", "c"):
+        cache.set(key, CachedResponse(etag=key, last_modified=None, payload=payload))
+        time.sleep(0.01)
+        cache.touch("a")
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+
+
+def test_api_call_uses_per_attempt_timeouts(requests_mock):
+    requests_mock.post(ROCKETS_QUERY_URL, json=[])
+
+    ThirdPartyAPI(timeout=7, connect_timeout=2).api_call(ROCKETS_QUERY_URL)
+
+    assert requests_mock.last_request.timeout == (2, 7)
+
+
+def test_api_call_caps_timeouts_by_deadline(requests_mock):
+    requests_mock.post(ROCKETS_QUERY_URL, json=[])
+    client = ThirdPartyAPI(timeout=7, connect_timeout=2)
+
+    with client.deadline_scope(1):
+        client.api_call(ROCKETS_QUERY_URL)
+
+    connect_timeout, read_timeout = requests_mock.last_request.timeout
+    assert 0 < connect_timeout <= 1
+    assert 0 < read_timeout <= 1
+
+
+def test_api_call_retries_honouring_retry_after(requests_mock):
+    requests_mock.post(
+        ROCKETS_QUERY_URL,
+        [
+            {"status_code": 503, "headers": {"Retry-After": "0"}},
+            {"json": [{"id": "r1"}]},
+        ],
+    )
+
+    response = ThirdPartyAPI().api_call(ROCKETS_QUERY_URL)
+
+    assert response.json() == [{"id": "r1"}]
+    assert requests_mock.call_count == 2
+
+
+def test_api_call_raises_last_error_after_max_retries(requests_mock):
+    requests_mock.post(ROCKETS_QUERY_URL, exc=requests.ConnectionError("refused"))
+
+    with pytest.raises(requests.ConnectionError, match="refused"):
+        ThirdPartyAPI(max_retries=2, base_backoff=0).api_call(ROCKETS_QUERY_URL)
+
+    assert requests_mock.call_count == 3
+
+
+def test_api_call_gives_up_when_deadline_cannot_cover_retry(requests_mock):
+    requests_mock.post(
+        ROCKETS_QUERY_URL, status_code=429, headers={"Retry-After": "60"}
+    )
+    client = ThirdPartyAPI()
+
+    start = time.monotonic()
+    with client.deadline_scope(5), pytest.raises(DeadlineExceeded):
+        client.api_call(ROCKETS_QUERY_URL)
+
+    assert time.monotonic() - start < 1
+    assert requests_mock.call_count == 1
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [(None, None), ("3", 3.0), ("-1", 0.0), ("Wed, 21 Oct 2015 07:28:00 GMT", 0.0)],
+)
+def test_parse_retry_after(value, expected):
+    assert parse_retry_after(value) == expected
+
+
+def test_dtos_are_decoded_to_typed_immutable_values(
+    mock_spacex_api_endpoint_launches: None,
+    mock_spacex_api_endpoint_launchpads: None,
+    mock_spacex_api_endpoint_rockets: None,
+):
+    data = SpaceX().fetch_data()
+    launch, rocket, launchpad = (data[key][0] for key in SpaceX.RESOURCES)
+
+    assert launch.date_utc == datetime(2006, 3, 24, 22, 30, tzinfo=timezone.utc)
+    assert rocket.first_flight == date(2006, 3, 24)
+    assert rocket.type is RocketType.ROCKET
+    assert launchpad.status is LaunchpadStatus.RETIRED
+    assert launchpad.latitude == Decimal("34.6440904")
+    assert not hasattr(launch, "__dict__")
+    with pytest.raises(AttributeError):
+        launch.success = True
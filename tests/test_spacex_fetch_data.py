@@ -1,7 +1,12 @@
+from datetime import datetime, timezone
+
 import pytest
 from django.core.management import call_command
+from requests import HTTPError
+
+from tracker.models import Launch, Launchpad, Rocket, SyncState
 
-from tracker.models import Launch, Launchpad, Rocket
+from .conftest import LAUNCHES, mock_query_endpoint
 
 # At the time when the test was written there were 4 rockets, 6 launchpads and 205 launches
 
@@ -54,3 +59,193 @@ def test_fetch_spacex_data_skips_existing_rocket(
     assert Rocket.objects.count() == 2
     assert Launchpad.objects.count() == 2
     assert Launch.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_fetch_spacex_data_saves_sync_watermark(
+    mock_spacex_api_endpoint_launches: None,
+    mock_spacex_api_endpoint_launchpads: None,
+    mock_spacex_api_endpoint_rockets: None,
+):
+    call_command("fetch_spacex_data")
+
+    state = SyncState.objects.get(resource="launches")
+    assert state.watermark == datetime(2007, 3, 21, 1, 10, tzinfo=timezone.utc)
+    assert state.pending_ids == []
+    assert state.synced_at is not None
+
+
+@pytest.mark.django_db
+def test_fetch_spacex_data_keeps_skipped_launch_pending(
+    requests_mock,
+    mock_spacex_api_endpoint_launchpads: None,
+    mock_spacex_api_endpoint_rockets: None,
+):
+    orphan = {**LAUNCHES[1], "rocket": "unknown-rocket"}
+    mock_query_endpoint(requests_mock, "launches", [LAUNCHES[0], orphan])
+
+    call_command("fetch_spacex_data")
+
+    assert not Launch.objects.filter(id=orphan["id"]).exists()
+    state = SyncState.objects.get(resource="launches")
+    assert state.pending_ids == [orphan["id"]]
+
+    # Fetched again by id, once its rocket is known
+    mock_query_endpoint(requests_mock, "launches", [LAUNCHES[1]])
+    call_command("fetch_spacex_data")
+
+    assert requests_mock.last_request.json()["query"]["$or"][2] == {
+        "_id": {"$in": [orphan["id"]]}
+    }
+    assert Launch.objects.filter(id=orphan["id"]).exists()
+    assert SyncState.objects.get(resource="launches").pending_ids == []
+
+
+@pytest.mark.django_db
+def test_fetch_spacex_data_incremental_queries_only_changed_launches(
+    requests_mock,
+    mock_spacex_api_endpoint_launches: None,
+    mock_spacex_api_endpoint_launchpads: None,
+    mock_spacex_api_endpoint_rockets: None,
+):
+    call_command("fetch_spacex_data")
+    call_command("fetch_spacex_data")
+    call_command("fetch_spacex_data", full=True)
+
+    launch_queries = [
+        request.json()["query"]
+        for request in requests_mock.request_history
+        if request.path == "/v4/launches/query"
+    ]
+    assert launch_queries == [
+        {},
+        {
+            "$or": [
+                {"date_utc": {"$gt": "2007-03-21T01:10:00Z"}},
+                {"upcoming": True},
+                {"_id": {"$in": []}},
+            ]
+        },
+        {},
+    ]
+
+
+@pytest.mark.django_db
+def test_fetch_spacex_data_refreshes_upcoming_launch(
+    requests_mock,
+    mock_spacex_api_endpoint_launchpads: None,
+    mock_spacex_api_endpoint_rockets: None,
+):
+    upcoming = {**LAUNCHES[0], "upcoming": True, "success": None}
+    mock_query_endpoint(requests_mock, "launches", [upcoming])
+
+    call_command("fetch_spacex_data")
+
+    assert Launch.objects.get(id=upcoming["id"]).upcoming is True
+    assert SyncState.objects.get(resource="launches").pending_ids == [upcoming["id"]]
+
+    mock_query_endpoint(requests_mock, "launches", [LAUNCHES[0]])
+
+    call_command("fetch_spacex_data")
+
+    launch = Launch.objects.get(id=upcoming["id"])
+    assert launch.upcoming is False
+    assert launch.success is False
+    assert SyncState.objects.get(resource="launches").pending_ids == []
+
+
+@pytest.mark.django_db
+def test_fetch_spacex_data_snapshot_round_trip(
+    tmp_path,
+    requests_mock,
+    mock_spacex_api_endpoint_launches: None,
+    mock_spacex_api_endpoint_launchpads: None,
+    mock_spacex_api_endpoint_rockets: None,
+):
+    snapshot = tmp_path / "spacex.ndjson.gz"
+
+    call_command("fetch_spacex_data", save_snapshot=str(snapshot))
+
+    assert snapshot.exists()
+    assert not snapshot.with_name("spacex.ndjson.gz.tmp").exists()
+
+    Launch.objects.all().delete()
+    Rocket.objects.all().delete()
+    Launchpad.objects.all().delete()
+    SyncState.objects.all().delete()
+    calls = requests_mock.call_count
+
+    call_command("fetch_spacex_data", from_snapshot=str(snapshot))
+
+    assert requests_mock.call_count == calls
+    assert Rocket.objects.count() == 2
+    assert Launchpad.objects.count() == 2
+    assert set(Launch.objects.values_list("id", flat=True)) == {
+        launch["id"] for launch in LAUNCHES
+    }
+
+
+@pytest.mark.django_db
+def test_fetch_spacex_data_failed_fetch_leaves_no_snapshot(
+    tmp_path,
+    requests_mock,
+    mock_spacex_api_endpoint_launches: None,
+    mock_spacex_api_endpoint_launchpads: None,
+):
+    requests_mock.post(
+        "https://api.spacexdata.com/v4/rockets/query", exc=ValueError("bad payload")
+    )
+    snapshot = tmp_path / "spacex.ndjson.gz"
+
+    with pytest.raises(ValueError):
+        call_command("fetch_spacex_data", save_snapshot=str(snapshot))
+
+    assert list(tmp_path.glob("spacex.ndjson.gz*")) == []
+
+
+@pytest.mark.django_db
+def test_fetch_spacex_data_full_sync_updates_changed_launches(
+    requests_mock,
+    mock_spacex_api_endpoint_launchpads: None,
+    mock_spacex_api_endpoint_rockets: None,
+):
+    mock_query_endpoint(requests_mock, "launches", LAUNCHES)
+    call_command("fetch_spacex_data")
+
+    changed = {**LAUNCHES[1], "details": "Rewritten upstream", "success": True}
+    mock_query_endpoint(requests_mock, "launches", [LAUNCHES[0], changed])
+    call_command("fetch_spacex_data", full=True)
+
+    launch = Launch.objects.get(id=changed["id"])
+    assert launch.details == "Rewritten upstream"
+    assert launch.success is True
+    assert Launch.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_fetch_spacex_data_upserts_launches_in_batches(
+    mock_spacex_api_endpoint_launches: None,
+    mock_spacex_api_endpoint_launchpads: None,
+    mock_spacex_api_endpoint_rockets: None,
+):
+    call_command("fetch_spacex_data", batch_size=1)
+
+    assert Launch.objects.count() == len(LAUNCHES)
+    state = SyncState.objects.get(resource="launches")
+    assert state.watermark == datetime(2007, 3, 21, 1, 10, tzinfo=timezone.utc)
+
+
+@pytest.mark.django_db
+def test_fetch_spacex_data_failed_launch_stream_rolls_back(
+    requests_mock,
+    mock_spacex_api_endpoint_launchpads: None,
+    mock_spacex_api_endpoint_rockets: None,
+):
+    requests_mock.post("https://api.spacexdata.com/v4/launches/query", status_code=404)
+
+    with pytest.raises(HTTPError):
+        call_command("fetch_spacex_data")
+
+    assert Rocket.objects.count() == 0
+    assert Launchpad.objects.count() == 0
+    assert SyncState.objects.get(resource="launches").watermark is None
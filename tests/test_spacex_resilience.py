@@ -0,0 +1,97 @@
+import time
+
+import pytest
+import requests
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from tracker.models import Launch
+from tracker.spacex.client import SpaceX, ThirdPartyAPI
+from tracker.spacex.exceptions import CircuitOpenError
+from tracker.spacex.resilience import CircuitBreaker, Deadline, TokenBucket
+
+ROCKETS_QUERY_URL = "https://api.spacexdata.com/v4/rockets/query"
+
+
+def test_token_bucket_allows_burst_then_throttles():
+    sleeps = []
+    bucket = TokenBucket(rate=10, capacity=2)
+
+    assert bucket.acquire(sleep=sleeps.append)
+    assert bucket.acquire(sleep=sleeps.append)
+    assert sleeps == []
+
+    assert not bucket.acquire(timeout=0.01, sleep=sleeps.append)
+    assert bucket.acquire(sleep=time.sleep)
+
+
+def test_circuit_breaker_opens_after_threshold_and_half_opens():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+
+    breaker.record_failure(RuntimeError("boom"))
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure(RuntimeError("boom"))
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+    time.sleep(0.06)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+    # Only one trial call at a time
+    assert not breaker.allow_request()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_circuit_breaker_reopens_when_trial_fails():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+    breaker.record_failure(RuntimeError("boom"))
+    time.sleep(0.02)
+
+    assert breaker.allow_request()
+    breaker.record_failure(RuntimeError("still down"))
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert "still down" in breaker.describe()
+
+
+def test_open_circuit_fails_fast_and_is_shared(settings, requests_mock):
+    settings.SPACEX_BREAKER_FAILURE_THRESHOLD = 2
+    requests_mock.post(ROCKETS_QUERY_URL, exc=requests.ConnectionError("refused"))
+
+    with pytest.raises(CircuitOpenError):
+        ThirdPartyAPI(max_retries=5, base_backoff=0).api_call(ROCKETS_QUERY_URL)
+    assert requests_mock.call_count == 2
+
+    # Another client of the same host doesn't even try
+    with pytest.raises(CircuitOpenError):
+        SpaceX().fetch_rockets()
+    assert requests_mock.call_count == 2
+    assert SpaceX().circuit_breaker.state == CircuitBreaker.OPEN
+
+
+@pytest.mark.django_db
+def test_fetch_spacex_data_skips_sync_while_circuit_open(settings, requests_mock):
+    settings.SPACEX_BREAKER_FAILURE_THRESHOLD = 1
+    requests_mock.post(ROCKETS_QUERY_URL, status_code=503)
+
+    with pytest.raises(CircuitOpenError):
+        SpaceX().api_call(ROCKETS_QUERY_URL)
+    calls = requests_mock.call_count
+
+    call_command("fetch_spacex_data")
+
+    assert requests_mock.call_count == calls
+    assert Launch.objects.count() == 0
+
+
+def test_deadline_of_zero_seconds_is_spent():
+    assert Deadline(0).expired
+    assert Deadline(0.0).remaining() == 0.0
+    assert Deadline(None).remaining() == float("inf")
+
+
+def test_fetch_spacex_data_rejects_non_positive_deadline():
+    with pytest.raises(CommandError, match="--deadline"):
+        call_command("fetch_spacex_data", deadline=0)
@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+from tracker.spacex.client import SpaceX
+from tracker.spacex.streaming import iter_json_array
+
+from .conftest import LAUNCHES, mock_query_endpoint
+
+PAGE = {
+    "docs": [{"id": "a", "name": "ä" * 5}, {"id": "b", "flight_number": 12}],
+    "totalDocs": 2,
+    "hasNextPage": False,
+    "nextPage": None,
+}
+
+
+def chunked(payload: bytes, size: int):
+    return (payload[i : i + size] for i in range(0, len(payload), size))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 4096])
+def test_iter_json_array_yields_items_of_keyed_array(chunk_size: int):
+    meta = {}
+    items = iter_json_array(
+        chunked(json.dumps(PAGE).encode(), chunk_size), key="docs", meta=meta
+    )
+
+    assert list(items) == PAGE["docs"]
+    assert meta == {"totalDocs": 2, "hasNextPage": False, "nextPage": None}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 4096])
+def test_iter_json_array_yields_items_of_top_level_array(chunk_size: int):
+    payload = b' [1, 22 , 333, {"x": [true, null]}, "s"] '
+
+    items = list(iter_json_array(chunked(payload, chunk_size)))
+
+    assert items == [1, 22, 333, {"x": [True, None]}, "s"]
+
+
+def test_iter_json_array_is_lazy():
+    def chunks():
+        yield b'[{"id": "a"},'
+        raise AssertionError("read past the first item")
+
+    assert next(iter_json_array(chunks())) == {"id": "a"}
+
+
+@pytest.mark.parametrize("payload", [b'[{"id": "a"}', b'[{"id": "a"}] []', b"{"])
+def test_iter_json_array_rejects_malformed_documents(payload: bytes):
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array([payload]))
+
+
+def test_stream_query_docs_pages_through_results(requests_mock):
+    mock_query_endpoint(requests_mock, "launches", LAUNCHES)
+
+    docs = list(SpaceX(page_size=1).stream_query_docs("launches"))
+
+    assert [doc["id"] for doc in docs] == [launch["id"] for launch in LAUNCHES]
+    assert requests_mock.call_count == 2
+
+
+def test_fetch_launches_returns_list_of_streamed_dtos(
+    mock_spacex_api_endpoint_launches: None,
+):
+    launches = SpaceX().fetch_launches()
+
+    assert isinstance(launches, list)
+    assert [launch.name for launch in launches] == ["FalconSat", "DemoSat"]
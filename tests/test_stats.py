@@ -1,10 +1,33 @@
-from datetime import datetime
+from collections import Counter
+from datetime import date, datetime
+from datetime import timezone as dt_timezone
+from io import StringIO
+from zoneinfo import ZoneInfo
 
 import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db.models import Count
+from django.db.models.functions import TruncMonth
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
-from rest_framework.test import APIClient
-from tracker.models import Launch, Rocket, Launchpad
 from django.utils.timezone import now, timedelta
+from rest_framework.test import APIClient
+
+from tracker.aggregates import stored_launch_counts
+from tracker.data_version import STATS, get_data_version
+from tracker.models import Launch, LaunchAggregate, Launchpad, Rocket, StatsSnapshot
+from tracker.stats import (
+    LAUNCH_STATS,
+    compute_launch_stats,
+    count_launches,
+    fold_launch_counts,
+    rebuild_launch_stats,
+)
+
+from .conftest import LAUNCHES, mock_query_endpoint
 
 
 @pytest.fixture
@@ -123,3 +146,320 @@ def test_stats_endpoint(api_client: APIClient, setup_launch_data: None):
     # Frequencies should be non-empty
     assert len(data["yearly_frequency"]) > 0
     assert len(data["monthly_frequency"]) > 0
+
+
+@pytest.mark.django_db
+def test_stats_served_from_snapshot_built_at_sync(
+    api_client: APIClient,
+    mock_spacex_api_endpoint_launches: None,
+    mock_spacex_api_endpoint_launchpads: None,
+    mock_spacex_api_endpoint_rockets: None,
+):
+    call_command("fetch_spacex_data", no_warm_up=True)
+
+    snapshot = StatsSnapshot.objects.get(name=LAUNCH_STATS)
+    assert snapshot.data_version == get_data_version(STATS) == 1
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get(reverse("v1:launch-stats-list"))
+
+    assert response.status_code == 200
+    assert sum(item["total"] for item in response.json()["launches_per_site"]) == (
+        Launch.objects.count()
+    )
+    assert not any("tracker_launch" in q["sql"] for q in queries.captured_queries)
+
+
+@pytest.mark.django_db
+def test_rebuild_stats_command(
+    api_client: APIClient, setup_launch_data: None, django_capture_on_commit_callbacks
+):
+    url = reverse("v1:launch-stats-list")
+    assert len(api_client.get(url).json()["launches_per_site"]) == 2
+    # Edited by hand, bypassing the stats counters
+    Launch.objects.filter(launchpad__name="Boca Chica").update(
+        launchpad_id="5e9e4501f5090910d4566f83"
+    )
+    # Until rebuilt
+    assert len(api_client.get(url).json()["launches_per_site"]) == 2
+
+    with django_capture_on_commit_callbacks(execute=True):
+        call_command("rebuild_stats", stdout=StringIO())
+
+    snapshot = StatsSnapshot.objects.get(name=LAUNCH_STATS)
+    assert snapshot.data_version == 1
+    assert snapshot.built_at is not None
+    assert len(api_client.get(url).json()["launches_per_site"]) == 1
+
+
+@pytest.mark.django_db
+def test_compute_launch_stats(setup_launch_data: None):
+    stats = compute_launch_stats()
+
+    assert stats["rocket_success_rates"] == [
+        {
+            "rocket__name": "Falcon 9",
+            "total": 2,
+            "success_count": 1,
+            "success_rate": 50.0,
+        },
+        {
+            "rocket__name": "Starship",
+            "total": 1,
+            "success_count": 1,
+            "success_rate": 100.0,
+        },
+    ]
+    assert stats["launches_per_site"] == [
+        {"launchpad__name": "Cape Canaveral", "total": 2},
+        {"launchpad__name": "Boca Chica", "total": 1},
+    ]
+    months = (
+        Launch.objects.annotate(month=TruncMonth("launch_datetime"))
+        .values("month")
+        .annotate(count=Count("id"))
+        .order_by("month")
+    )
+    assert stats["monthly_frequency"] == list(months)
+    assert sum(year["count"] for year in stats["yearly_frequency"]) == 3
+
+
+@pytest.mark.django_db
+def test_compute_launch_stats_in_current_time_zone(settings, launch1: Launch):
+    settings.TIME_ZONE = "America/New_York"
+    Launch.objects.filter(id=launch1.id).update(
+        launch_datetime=datetime(2021, 1, 1, 2, tzinfo=dt_timezone.utc)
+    )
+
+    stats = compute_launch_stats()
+
+    # Still 2020 in New York
+    new_york = ZoneInfo("America/New_York")
+    assert stats["yearly_frequency"] == [
+        {"year": datetime(2020, 1, 1, tzinfo=new_york), "count": 1}
+    ]
+    assert stats["monthly_frequency"] == [
+        {"month": datetime(2020, 12, 1, tzinfo=new_york), "count": 1}
+    ]
+
+
+@pytest.fixture
+def monthly_launches(setup_launch_data: None) -> None:
+    rockets = list(Rocket.objects.order_by("id"))
+    launchpads = list(Launchpad.objects.order_by("id"))
+    start = datetime(2022, 11, 3, 8, tzinfo=dt_timezone.utc)
+    Launch.objects.bulk_create(
+        Launch(
+            id=f"m{i}",
+            name=f"Launch {i}",
+            launch_datetime=start + timedelta(days=11 * i, hours=i),
+            success=None if i % 5 == 0 else i % 3 != 0,
+            rocket=rockets[i % 2],
+            launchpad=launchpads[i % 3 // 2],
+            upcoming=False,
+        )
+        for i in range(60)
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "params,lookups",
+    [
+        (
+            {"rocket__name": "Starship"},
+            {"rocket__name": "Starship"},
+        ),
+        (
+            {
+                "launch_datetime__gte": "2023-03-15T12:00:00Z",
+                "launch_datetime__lte": "2024-02-01T00:00:00Z",
+                "launchpad__name": "Cape Canaveral",
+            },
+            {
+                "launch_datetime__gte": datetime(
+                    2023, 3, 15, 12, tzinfo=dt_timezone.utc
+                ),
+                "launch_datetime__lte": datetime(2024, 2, 1, tzinfo=dt_timezone.utc),
+                "launchpad__name": "Cape Canaveral",
+            },
+        ),
+        (
+            {
+                "launch_date__gte": "01-04-2023",
+                "launch_date__lte": "2023-06-30",
+                "success": "true",
+            },
+            {
+                "launch_datetime__date__gte": date(2023, 4, 1),
+                "launch_datetime__date__lte": date(2023, 6, 30),
+                "success": True,
+            },
+        ),
+        (
+            {"launch_date__gte": "2023-05-02", "launch_date__lte": "2023-05-20"},
+            {
+                "launch_datetime__date__gte": date(2023, 5, 2),
+                "launch_datetime__date__lte": date(2023, 5, 20),
+            },
+        ),
+        (
+            {"launch_datetime__gte": "2023-09-01T00:00:00Z", "success": "false"},
+            {
+                "launch_datetime__gte": datetime(2023, 9, 1, tzinfo=dt_timezone.utc),
+                "success": False,
+            },
+        ),
+    ],
+)
+def test_filtered_stats(
+    api_client: APIClient, monthly_launches: None, params: dict, lookups: dict
+):
+    response = api_client.get(reverse("v1:launch-stats-list"), params)
+
+    assert response.status_code == 200
+    launches = Launch.objects.filter(**lookups)
+    assert launches.exists()
+    assert response.data == fold_launch_counts(count_launches(launches))
+
+
+@pytest.mark.django_db
+def test_filtered_stats_whole_months_counted_from_buckets(
+    api_client: APIClient, monthly_launches: None
+):
+    url = reverse("v1:launch-stats-list")
+    # As the sync does
+    rebuild_launch_stats()
+
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get(
+            url, {"launch_date__gte": "2023-01-01", "launch_date__lte": "2023-12-31"}
+        )
+
+    assert response.status_code == 200
+    assert sum(month["count"] for month in response.data["monthly_frequency"]) == (
+        Launch.objects.filter(launch_datetime__year=2023).count()
+    )
+    assert not any('"tracker_launch"' in q["sql"] for q in queries.captured_queries)
+
+
+@pytest.mark.django_db
+def test_filtered_stats_cached_per_canonical_filters(
+    api_client: APIClient, monthly_launches: None
+):
+    url = reverse("v1:launch-stats-list")
+    queries = [
+        {"success": "true", "launch_date__gte": "2023-01-01"},
+        {"launch_date__gte": "01-01-2023", "success": "True", "rocket__name": ""},
+        {"success": "false", "launch_date__gte": "2023-01-01"},
+    ]
+
+    assert [api_client.get(url, q).headers["X-Cache"] for q in queries] == [
+        "MISS",
+        "HIT",
+        "MISS",
+    ]
+    assert api_client.get(url, {"launch_date__gte": "nope"}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_sync_updates_stats_counters_by_deltas(
+    requests_mock,
+    mock_spacex_api_endpoint_launchpads: None,
+    mock_spacex_api_endpoint_rockets: None,
+):
+    mock_query_endpoint(requests_mock, "launches", LAUNCHES)
+    call_command("fetch_spacex_data", no_warm_up=True)
+    assert stored_launch_counts() == count_launches(Launch.objects.all())
+    unchanged = LaunchAggregate.objects.get(month=date(2007, 3, 1))
+
+    # A flip of outcome, a move to another month, and a new launch in the
+    # month left, which leaves its counter as it was
+    mock_query_endpoint(
+        requests_mock,
+        "launches",
+        [
+            {**LAUNCHES[0], "success": True},
+            {**LAUNCHES[1], "date_utc": "2007-04-21T01:10:00.000Z"},
+            {**LAUNCHES[1], "id": "5eb87cdaffd86e000604b32c"},
+            # Returned twice by pages of a collection changing meanwhile
+            {**LAUNCHES[1], "date_utc": "2007-04-21T01:10:00.000Z"},
+        ],
+    )
+    call_command("fetch_spacex_data", full=True, no_warm_up=True)
+
+    counts = count_launches(Launch.objects.all())
+    assert stored_launch_counts() == counts
+    assert LaunchAggregate.objects.count() == len(counts) == 3
+    assert LaunchAggregate.objects.get(pk=unchanged.pk).count == 1
+    data = StatsSnapshot.objects.get(name=LAUNCH_STATS).data
+    expected = fold_launch_counts(counts)
+    assert data["rocket_success_rates"] == expected["rocket_success_rates"]
+    assert [item["count"] for item in data["monthly_frequency"]] == [1, 1, 1]
+
+
+@pytest.mark.django_db
+def test_deleted_launches_uncounted(
+    api_client: APIClient,
+    setup_launch_data: None,
+    django_assert_max_num_queries,
+    django_capture_on_commit_callbacks,
+):
+    url = reverse("v1:launch-stats-list")
+    rebuild_launch_stats()
+    assert stored_launch_counts()
+    assert len(api_client.get(url).json()["launches_per_site"]) == 2
+
+    # Counted in one pass and deleted in one query, then an UPDATE per counter
+    # and the rebuild of the stats, whatever the number of launches
+    with django_capture_on_commit_callbacks(execute=True):
+        with django_assert_max_num_queries(30):
+            Launch.objects.filter(rocket__name="Falcon 9").delete()
+        Launch.objects.get(launchpad__name="Boca Chica").delete()
+
+    assert not Launch.objects.exists()
+    assert stored_launch_counts() == Counter()
+    assert get_data_version(STATS) == 2
+    # Stale cached responses aside, filtered and unfiltered stats agree
+    assert api_client.get(url).json()["launches_per_site"] == []
+    assert api_client.get(url, {"success": "true"}).json()["launches_per_site"] == []
+
+
+@pytest.mark.django_db
+def test_check_stats_command(
+    api_client: APIClient, setup_launch_data: None, django_capture_on_commit_callbacks
+):
+    rebuild_launch_stats()
+    stdout = StringIO()
+    call_command("check_stats", stdout=stdout)
+    assert "Stats counters match" in stdout.getvalue()
+
+    LaunchAggregate.objects.filter(success=True).update(count=100)
+    with pytest.raises(CommandError, match="stats counters differ"):
+        call_command("check_stats", stdout=StringIO())
+
+    with django_capture_on_commit_callbacks(execute=True):
+        call_command("check_stats", fix=True, stdout=StringIO())
+
+    assert stored_launch_counts() == count_launches(Launch.objects.all())
+    assert get_data_version(STATS) == 1
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("params", [{}, {"launch_date__gte": "2023-01-01"}])
+def test_stats_requests_dont_build_counters(
+    api_client: APIClient, monthly_launches: None, params: dict
+):
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get(reverse("v1:launch-stats-list"), params)
+
+    assert response.status_code == 200
+    # Computed from the launches until a sync builds the counters
+    assert not any(
+        q["sql"].startswith(("INSERT", "UPDATE", "DELETE"))
+        for q in queries.captured_queries
+    )
+    assert not StatsSnapshot.objects.exists()
+    rebuild_launch_stats()
+    cache.clear()
+    built = api_client.get(reverse("v1:launch-stats-list"), params)
+    assert response.json() == built.json()
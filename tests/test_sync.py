@@ -0,0 +1,70 @@
+import pytest
+
+from tracker.models import Launchpad, Rocket
+from tracker.spacex.dataclasses import LaunchpadDTO, RocketDTO
+from tracker.sync import (
+    LAUNCHPAD_FIELDS,
+    ROCKET_FIELDS,
+    SyncResult,
+    launchpad_from_dto,
+    rocket_from_dto,
+    upsert,
+)
+
+from .conftest import LAUNCHPADS, ROCKETS
+
+
+@pytest.fixture
+def rockets() -> list[Rocket]:
+    return [rocket_from_dto(RocketDTO.from_api(item)) for item in ROCKETS]
+
+
+@pytest.mark.django_db
+def test_upsert_inserts_updates_and_skips_unchanged(rockets: list[Rocket]):
+    assert upsert(Rocket, rockets, ROCKET_FIELDS) == SyncResult(inserted=2)
+
+    rockets = [rocket_from_dto(RocketDTO.from_api(item)) for item in ROCKETS]
+    rockets[1].description = "Updated upstream"
+    created_at = Rocket.objects.get(id=rockets[1].id).created_at
+
+    assert upsert(Rocket, rockets, ROCKET_FIELDS) == SyncResult(updated=1, skipped=1)
+
+    rocket = Rocket.objects.get(id=rockets[1].id)
+    assert rocket.description == "Updated upstream"
+    assert rocket.created_at == created_at
+
+
+@pytest.mark.django_db
+def test_upsert_runs_fixed_number_of_queries_per_batch(
+    django_assert_num_queries, rockets: list[Rocket], falcon_1_rocket: Rocket
+):
+    # Per batch: one SELECT of stored fingerprints and one INSERT .. ON CONFLICT
+    with django_assert_num_queries(4):
+        result = upsert(Rocket, rockets, ROCKET_FIELDS, batch_size=1)
+
+    assert result == SyncResult(inserted=1, updated=1)
+
+
+@pytest.mark.django_db
+def test_upsert_stores_fingerprint_stable_across_resyncs():
+    def launchpads() -> list[Launchpad]:
+        return [launchpad_from_dto(LaunchpadDTO.from_api(item)) for item in LAUNCHPADS]
+
+    assert upsert(Launchpad, launchpads(), LAUNCHPAD_FIELDS).inserted == len(LAUNCHPADS)
+    stored = dict(Launchpad.objects.values_list("id", "fingerprint"))
+    assert all(len(value) == 32 for value in stored.values())
+
+    # The same upstream documents hash to the same fingerprints on every sync
+    assert upsert(Launchpad, launchpads(), LAUNCHPAD_FIELDS) == SyncResult(
+        skipped=len(LAUNCHPADS)
+    )
+    assert dict(Launchpad.objects.values_list("id", "fingerprint")) == stored
+
+
+@pytest.mark.django_db
+def test_upsert_writes_objects_repeated_in_batch_once(rockets: list[Rocket]):
+    repeated = rocket_from_dto(RocketDTO.from_api(ROCKETS[1]))
+    repeated.description = "Second copy"
+
+    assert upsert(Rocket, [*rockets, repeated], ROCKET_FIELDS) == SyncResult(inserted=2)
+    assert Rocket.objects.get(id=repeated.id).description == "Second copy"
@@ -0,0 +1,128 @@
+from datetime import date, datetime, timezone
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from tracker.models import Launch, Launchpad, Rocket
+from tracker.timeseries import count_launches_by_day, launch_time_series
+
+
+@pytest.fixture
+def timeseries_launches(launch1: Launch, launch2: Launch, falcon_1_rocket: Rocket):
+    falcon_9 = Rocket.objects.create(
+        id="falcon9",
+        name="Falcon 9",
+        mass=549054,
+        type="rocket",
+        active=True,
+        stages=2,
+        boosters=0,
+        cost_per_launch=50000000,
+        success_rate_pct=98,
+        first_flight=date(2010, 6, 4),
+    )
+    Launch.objects.all().delete()
+    launchpad = Launchpad.objects.get(id="lp1")
+    for i, (day, rocket, success) in enumerate(
+        [
+            (datetime(2020, 1, 6, 12), falcon_9, True),
+            (datetime(2020, 1, 7, 12), falcon_1_rocket, False),
+            (datetime(2020, 1, 7, 18), falcon_9, True),
+            (datetime(2020, 1, 10, 9), falcon_9, False),
+            (datetime(2020, 3, 30, 9), falcon_9, None),
+            (datetime(2020, 4, 2, 9), falcon_1_rocket, True),
+        ]
+    ):
+        Launch.objects.create(
+            id=f"ts{i}",
+            name=f"Launch {i}",
+            launch_datetime=day.replace(tzinfo=timezone.utc),
+            success=success,
+            rocket=rocket,
+            launchpad=launchpad,
+            upcoming=success is None,
+        )
+
+
+@pytest.mark.django_db
+def test_monthly_time_series_with_rolling_window(
+    api_client: APIClient, timeseries_launches: None
+):
+    response = api_client.get(
+        reverse("v1:launch-stats-timeseries"), {"bucket": "month", "window": 2}
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "bucket": "month",
+        "window": 2,
+        "group_by": None,
+        "buckets": ["2020-01-01", "2020-02-01", "2020-03-01", "2020-04-01"],
+        "series": [
+            {
+                "name": None,
+                "launches": [4, 0, 1, 1],
+                "successes": [2, 0, 0, 1],
+                "rolling_success_rate": [50.0, 50.0, 0.0, 50.0],
+                "cadence": [4.0, 2.0, 0.5, 1.0],
+            }
+        ],
+    }
+
+
+@pytest.mark.django_db
+def test_daily_time_series_grouped_by_rocket(
+    api_client: APIClient, timeseries_launches: None
+):
+    response = api_client.get(
+        reverse("v1:launch-stats-timeseries"),
+        {
+            "bucket": "day",
+            "group_by": "rocket",
+            "window": 3,
+            "launch_date__lte": "2020-01-31",
+        },
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["buckets"] == [f"2020-01-{day:02}" for day in range(6, 11)]
+    assert [series["name"] for series in data["series"]] == ["Falcon 9", "Falcon 1"]
+    falcon_9, falcon_1 = data["series"]
+    assert falcon_9["launches"] == [1, 1, 0, 0, 1]
+    assert falcon_9["rolling_success_rate"] == [100.0, 100.0, 100.0, 100.0, 0.0]
+    # Over the buckets so far at the start, like the success rate
+    assert falcon_9["cadence"] == [1.0, 1.0, 0.67, 0.33, 0.33]
+    assert falcon_1["launches"] == [0, 1, 0, 0, 0]
+    assert falcon_1["rolling_success_rate"] == [None, 0.0, 0.0, 0.0, None]
+
+
+@pytest.mark.django_db
+def test_quarterly_time_series_from_monthly_counts_matches_daily_counts(
+    api_client: APIClient, timeseries_launches: None
+):
+    params = {"bucket": "quarter", "group_by": "launchpad", "window": 4}
+    response = api_client.get(reverse("v1:launch-stats-timeseries"), params)
+
+    assert response.status_code == 200
+    assert response.data == launch_time_series(
+        count_launches_by_day(Launch.objects.all()),
+        bucket="quarter",
+        window=4,
+        group_by="launchpad",
+    )
+    assert response.data["buckets"] == [date(2020, 1, 1), date(2020, 4, 1)]
+
+
+@pytest.mark.django_db
+def test_time_series_params(api_client: APIClient, timeseries_launches: None):
+    url = reverse("v1:launch-stats-timeseries")
+
+    assert api_client.get(url, {"bucket": "hour"}).status_code == 400
+    assert api_client.get(url, {"window": 0}).status_code == 400
+    assert api_client.get(url, {"group_by": "mission"}).status_code == 400
+    assert [
+        api_client.get(url, params).headers["X-Cache"]
+        for params in ({}, {"bucket": "month", "window": "1"}, {"bucket": "week"})
+    ] == ["MISS", "HIT", "MISS"]
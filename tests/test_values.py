@@ -0,0 +1,101 @@
+import pytest
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from api.v1.serializers import LaunchSerializer
+from tracker.data_version import ROCKETS, bump_data_version
+from tracker.models import Launch, Rocket
+
+
+@pytest.fixture
+def launch3(launch1: Launch) -> Launch:
+    # Outcome unknown
+    return Launch.objects.create(
+        id="l3",
+        name="DemoSat",
+        launch_datetime=launch1.launch_datetime.replace(microsecond=0),
+        success=None,
+        rocket=launch1.rocket,
+        launchpad=launch1.launchpad,
+        upcoming=True,
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "params",
+    [
+        {},
+        {"expand": "rocket,launchpad"},
+        {"expand": "launchpad", "fields": "launchpad,success,id"},
+        {"pagination": "offset", "expand": "rocket"},
+    ],
+)
+def test_launch_list_renders_like_launch_serializer(
+    api_client: APIClient,
+    launch1: Launch,
+    launch2: Launch,
+    launch3: Launch,
+    params: dict,
+):
+    response = api_client.get(reverse("v1:launch-list"), params)
+
+    assert response.status_code == 200
+    fields = params["fields"].split(",") if "fields" in params else None
+    expand = params["expand"].split(",") if "expand" in params else ()
+    expected = LaunchSerializer(
+        Launch.objects.order_by("launch_datetime", "id"),
+        many=True,
+        fields=fields,
+        expand=expand,
+    ).data
+    renderer = JSONRenderer()
+    assert renderer.render(response.data["results"]) == renderer.render(expected)
+
+
+@pytest.mark.django_db
+def test_launch_list_expanded_rockets_refreshed_by_data_version_bump(
+    api_client: APIClient, launch1: Launch, django_capture_on_commit_callbacks
+):
+    url = reverse("v1:launch-list")
+    api_client.get(url, {"expand": "rocket"})
+    Rocket.objects.filter(id=launch1.rocket_id).update(name="Falcon 1e")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        bump_data_version(ROCKETS)
+    response = api_client.get(url, {"expand": "rocket"})
+
+    assert response.json()["results"][0]["rocket"]["name"] == "Falcon 1e"
+
+
+@pytest.mark.django_db
+def test_launch_list_expands_rocket_created_since_cached(
+    api_client: APIClient, launch1: Launch
+):
+    url = reverse("v1:launch-list")
+    api_client.get(url, {"expand": "rocket"})
+    # Before the version bump reaches this process
+    rocket = Rocket.objects.create(
+        **{
+            **Rocket.objects.filter(id=launch1.rocket_id).values()[0],
+            "id": "newr",
+            "name": "New rocket",
+        }
+    )
+    Launch.objects.create(
+        id="l4",
+        name="Maiden flight",
+        launch_datetime=launch1.launch_datetime,
+        upcoming=True,
+        rocket=rocket,
+        launchpad=launch1.launchpad,
+    )
+
+    response = api_client.get(url, {"expand": "rocket", "limit": 5})
+
+    assert response.status_code == 200
+    assert {item["rocket"]["name"] for item in response.json()["results"]} == {
+        "Falcon 1",
+        "New rocket",
+    }